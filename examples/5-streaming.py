@@ -6,21 +6,13 @@ from uniplot import plot_gen
 
 MAX_SECONDS = 30
 
-# Initialize lists for values of x and y coordinates
-xs = []
-ys = []
-
 # Initialize plot object with default options
-plt = plot_gen(width=100, lines=True, color=True)
+plt = plot_gen(width=100, lines=True, color=True, title="Streaming ...")
 
 for _ in range(MAX_SECONDS):
-    # Append current time stamp
-    xs.append(datetime.datetime.now())
-    # Append a random number (normal distribution)
-    ys.append(random.gauss(0.5, 1.0))
-
-    # Draw plot with new values
-    plt.update(xs=xs, ys=ys, title=f"Streaming: {len(ys)} data point(s) ...")
+    # Append the current time stamp and a random number (normal distribution),
+    # and draw the plot with the new point
+    plt.append(xs=[datetime.datetime.now()], ys=[random.gauss(0.5, 1.0)])
 
     # Wait for 1s (simulating the data rate of some input stream)
     time.sleep(1)
@@ -1,5 +1,4 @@
-from uniplot import plot_gen
-from collections import deque
+from uniplot import plot_gen, RingBuffer
 import time
 import math
 
@@ -18,7 +17,8 @@ def wave_generator(a1=1, frequency=1, phase_shift=0.4, f2=6.1343):
 
 NR_ITERATIONS = 200
 
-deq = deque([0] * NR_ITERATIONS, maxlen=NR_ITERATIONS)
+ring = RingBuffer(NR_ITERATIONS)
+ring.extend([0] * NR_ITERATIONS)
 
 plt = plot_gen(
     width=100, y_unit="$", title="Price", color=["green"], y_min=-5, y_max=5, lines=True
@@ -26,9 +26,8 @@ plt = plot_gen(
 
 start = time.perf_counter()
 for i in wave_generator():
-    deq.append(i)
-    deq2 = [0.8 + i * 0.3 for i in deq]
-    plt.update(ys=[deq])
+    ring.append(i)
+    plt.update(ys=ring)
 stop = time.perf_counter()
 
 print(
@@ -0,0 +1,68 @@
+import numpy as np
+from time import time
+from uniplot import plot
+from uniplot.multi_series import MultiSeries
+from uniplot.param_initializer import validate_and_transform_options
+from uniplot.sections import generate_body_raw_elements
+
+# Set random seed for reproducibility
+np.random.seed(42)
+
+NR_SAMPLES = 5_000
+COLOR_OPTIONS = {
+    "terminal colors": True,
+    "truecolor": "tableau",
+}
+NR_SERIES = [1, 2, 4, 8]
+
+
+def benchmark_output_size(nr_series: int, color):
+    xs = [np.arange(NR_SAMPLES)] * nr_series
+    ys = [np.cumsum(np.random.normal(size=NR_SAMPLES)) for _ in range(nr_series)]
+    series = MultiSeries(xs=xs, ys=ys)
+    options = validate_and_transform_options(
+        series=series, kwargs={"color": color, "lines": True, "width": 120}
+    )
+    _, _, surface = generate_body_raw_elements(series, options)
+
+    start_time = time()
+    run_length_output = "\n".join(surface.rows())
+    runtime = time() - start_time
+    # One pair of escape codes per colored cell, as used before
+    per_cell_output = "\n".join("".join(row) for row in surface.to_character_matrix())
+
+    return (
+        runtime,
+        len(run_length_output.encode()) / 1e3,
+        len(per_cell_output.encode()) / 1e3,
+    )
+
+
+for name, color in COLOR_OPTIONS.items():
+    times = []
+    run_length_size = []
+    per_cell_size = []
+
+    print(f"Benchmarking output size with {name}:")
+    for nr_series in NR_SERIES:
+        runtime, run_length, per_cell = benchmark_output_size(nr_series, color)
+        times.append(runtime)
+        run_length_size.append(run_length)
+        per_cell_size.append(per_cell)
+
+    print(f"nr_series = {NR_SERIES}")
+    print(f"times = {times}")
+    print(f"run_length_size = {run_length_size}")
+    print(f"per_cell_size = {per_cell_size}")
+
+    plot(
+        xs=[NR_SERIES] * 2,
+        ys=[run_length_size, per_cell_size],
+        lines=True,
+        title=f"Number of series versus output size with {name}, dots + lines",
+        legend_labels=["run-length merged", "per cell"],
+        y_unit=" kB",
+        y_min=0,
+        color=False,
+        character_set="ascii",
+    )
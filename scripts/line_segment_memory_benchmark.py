@@ -0,0 +1,93 @@
+import tracemalloc
+from functools import partial
+
+import numpy as np
+from time import time
+from uniplot import plot
+from uniplot.pixel_matrix import render, BATCH_SIZE
+
+results_plot = partial(plot, character_set="ascii", color=False)
+
+# Set random seed for reproducibility
+np.random.seed(42)
+
+NR_SAMPLES = 100_000
+WIDTH = 120
+HEIGHT = 200
+# Shape parameters of the Pareto distribution, smaller means heavier tails
+PARETO_SHAPES = [3.0, 2.0, 1.5, 1.0, 0.75, 0.5]
+
+
+def spiky_sensor_data(shape: float):
+    """
+    Mostly flat signal, with occasional spikes with heavy-tailed amplitudes.
+    """
+    ys = np.random.normal(0, 0.01, NR_SAMPLES)
+    spikes = np.random.uniform(size=NR_SAMPLES) < 0.01
+    ys[spikes] += np.random.pareto(shape, size=spikes.sum())
+    return ys
+
+
+def benchmark_render(ys):
+    xs = np.arange(len(ys))
+    y_min, y_max = ys.min(), ys.max()
+
+    tracemalloc.start()
+    start_time = time()
+    render(
+        xs,
+        ys,
+        x_min=0,
+        x_max=len(xs),
+        y_min=y_min,
+        y_max=y_max,
+        width=WIDTH,
+        height=HEIGHT,
+        lines=True,
+    )
+    runtime = time() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Estimate for a single dense step matrix of shape (batch size, longest
+    # segment in batch) with 8 bytes per entry, as used before the ragged
+    # expansion
+    ys_pix = (HEIGHT - 1) * (ys - y_min) / (y_max - y_min)
+    segment_lengths = np.ceil(np.abs(np.diff(ys_pix))) + 1
+    padded_memory = max(
+        8 * len(batch) * batch.max()
+        for batch in np.array_split(segment_lengths, len(ys) // BATCH_SIZE)
+    )
+
+    return (runtime, peak_memory / 1e6, float(padded_memory) / 1e6)
+
+
+times = []
+memory = []
+padded_memory = []
+
+print(f"Starting benchmark with {NR_SAMPLES} samples:")
+for shape in PARETO_SHAPES:
+    print(f"Benchmarking Pareto shape {shape}...")
+    runtime, peak, padded = benchmark_render(spiky_sensor_data(shape))
+    times.append(runtime)
+    memory.append(peak)
+    padded_memory.append(padded)
+
+print("Benchmarking done.")
+
+print(f"pareto_shapes = {PARETO_SHAPES}")
+print(f"times = {times}")
+print(f"memory = {memory}")
+print(f"padded_memory = {padded_memory}")
+
+results_plot(
+    xs=[PARETO_SHAPES] * 2,
+    ys=[memory, padded_memory],
+    lines=True,
+    title="Pareto shape of spikes versus peak memory, dots + lines",
+    legend_labels=["ragged (measured)", "padded (estimated, per matrix)"],
+    y_unit=" MB",
+    y_as_log=True,
+    y_gridlines=[],
+)
@@ -13,3 +13,14 @@ def test_plotting_one_million_points():
     start_time = time.time()
     plot(ys)
     assert time.time() - start_time < acceptable_time_in_seconds
+
+
+def test_plotting_one_million_points_with_lines():
+    nr_samples = 1_000_000
+    acceptable_time_in_seconds = 0.5
+
+    ys = np.random.normal(0, 1, nr_samples)
+
+    start_time = time.time()
+    plot(ys, lines=True)
+    assert time.time() - start_time < acceptable_time_in_seconds
@@ -7,7 +7,18 @@ import numpy as np
 from random import random
 import datetime
 
-from uniplot import plot, plot_to_string, plot_gen, histogram, histogram_to_string
+from uniplot import (
+    plot,
+    plot_to_string,
+    plot_gen,
+    histogram,
+    histogram_to_string,
+    imshow,
+    imshow_to_string,
+    sparklines,
+    RingBuffer,
+    HeatmapGrid,
+)
 
 
 ################
@@ -113,6 +124,16 @@ def test_plotting_with_colored_gridlines():
     )
 
 
+def test_plotting_with_arrays_of_gridlines():
+    plot(
+        [1, 2, -3, 4],
+        x_gridlines=np.linspace(0, 3, 1000),
+        y_gridlines=np.array([0.5, 2]),
+        x_gridlines_color=["red", "blue"],
+        y_as_log=True,
+    )
+
+
 def test_plotting_time_series_with_bounds_set_manually():
     dates = np.arange("2024-02-17T09:21", 4 * 60, 60, dtype="M8[m]")
     plot(xs=dates, ys=[1, 2, 3, 2], x_min=dates[0], x_max=dates[-1])
@@ -198,6 +219,29 @@ def test_plotting_to_string_without_axis_labels():
 ####################
 
 
+def test_plotting_density_of_many_points():
+    xs = np.random.normal(size=100_000)
+    ys = np.random.normal(size=100_000)
+
+    output = plot_to_string(xs=xs, ys=ys, density=True, x_gridlines=[], y_gridlines=[])
+
+    assert "█" in output
+    assert "░" in output
+
+
+def test_plot_gen_with_heatmap_of_events():
+    grid = HeatmapGrid(width=30, height=8, column_duration=1.0, y_min=0.01, y_max=10)
+    plt = plot_gen(heatmap=grid, return_string=True)
+    start = np.datetime64("2024-01-01T00:00:00")
+    for step in range(40):
+        times = start + np.timedelta64(step, "s") + np.arange(100).astype("m8[ms]")
+        output = plt.append(ys=np.random.lognormal(-3, 1, size=100), xs=times)
+
+    assert grid.counts.sum() <= 40 * 100
+    assert "█" in output
+    assert len(output.split("\n")) == 8 + 3
+
+
 def test_plot_gen_init_and_update():
     plt = plot_gen(width=30)
     plt.update(ys=[1, 2, 3], title="Single update")
@@ -212,6 +256,80 @@ def test_plot_gen_update_without_changing_any_options():
     plt.update(ys=[1, 2, 3, 4])
 
 
+def test_plot_gen_with_cell_updates_writes_fewer_bytes():
+    ys = np.sin(np.arange(1000) / 100)
+    bytes_per_frame = []
+    for cell_updates in [False, True]:
+        plt = plot_gen(width=200, y_min=-2, y_max=2, cell_updates=cell_updates)
+        plt.update(ys=ys)
+        ys[500] = 1.5
+        plt.update(ys=ys)
+        bytes_per_frame.append(plt.bytes_per_frame)
+
+    assert bytes_per_frame[1] < bytes_per_frame[0]
+
+
+def test_plot_gen_append_gives_same_plot_as_update():
+    plt = plot_gen(return_string=True, lines=True, y_min=-2, y_max=2)
+    plt.update(ys=[[1, 0, 1], [0, 1, 0]])
+    output = plt.append(ys=[[-1, 0.5], [0, 1.5]])
+
+    assert output == plot_to_string(
+        ys=[[1, 0, 1, -1, 0.5], [0, 1, 0, 0, 1.5]], lines=True, y_min=-2, y_max=2
+    )
+
+
+def test_plot_gen_with_ring_buffer_gives_same_plot_as_arrays():
+    plt = plot_gen(return_string=True, width=20, lines=True, y_min=-1, y_max=1)
+    ring = RingBuffer(40)
+    for step in range(5):
+        ring.extend(np.sin(np.arange(step * 8, (step + 1) * 8) / 3))
+        first = ring.index()[0]
+        bounds = {"x_min": first, "x_max": first + ring.capacity - 1}
+        output = plt.update(ys=ring, **bounds)
+
+        assert output == plot_to_string(
+            xs=ring.index(),
+            ys=np.array(ring),
+            width=20,
+            lines=True,
+            y_min=-1,
+            y_max=1,
+            **bounds,
+        )
+
+
+def test_plot_gen_view_follows_ring_buffer():
+    options = {"width": 20, "lines": True, "y_min": -1, "y_max": 1}
+    plt = plot_gen(return_string=True, **options)
+    ring = RingBuffer(30)
+    for step in range(10):
+        ring.extend(np.sin(np.arange(step * 7, (step + 1) * 7) / 3))
+        output = plt.update(ys=ring)
+        x_min, x_max = plt.options.x_min, plt.options.x_max
+
+        assert x_min <= ring.index()[0] and ring.nr_appended <= x_max
+        assert output == plot_to_string(
+            xs=ring.index(), ys=np.array(ring), x_min=x_min, x_max=x_max, **options
+        )
+
+
+def test_ring_buffer_scrolled_by_fractional_pixels_per_point():
+    # 153 pixel column steps for 34 point steps, so 4.5 pixels per point
+    options = {"width": 77, "height": 5, "lines": True, "y_min": -1, "y_max": 1}
+    plt = plot_gen(return_string=True, **options)
+    ring = RingBuffer(35)
+    for step in range(20):
+        ring.extend(np.sin([step, step + 0.5]))
+        first = ring.index()[0]
+        bounds = {"x_min": first, "x_max": first + ring.capacity - 1}
+        output = plt.update(ys=ring, **bounds)
+
+        assert output == plot_to_string(
+            xs=ring.index(), ys=np.array(ring), **options, **bounds
+        )
+
+
 #####################
 # Testing histogram #
 #####################
@@ -230,3 +348,43 @@ def test_plotting_a_histogram():
 def test_plotting_a_histogram_to_string():
     xs = [1, 2, 3, 2, 3, 2, 1]
     histogram_to_string(xs)
+
+
+##################
+# Testing imshow #
+##################
+
+
+def test_showing_an_image():
+    x = np.linspace(-3, 3, 200)
+    imshow(np.sin(x[:, None] * x[None, :]), title="Sine image")
+
+
+def test_showing_a_small_matrix_to_string():
+    output = imshow_to_string([[5, 1], [0, 7]], width=4, color_map="gray")
+    lines = output.split("\n")
+
+    assert len(lines) == 5
+    assert lines[1].endswith("│ 0")
+    assert lines[2].endswith("│ 1")
+    assert "\033[38;2;255;255;255m██" in lines[2]
+
+
+######################
+# Testing sparklines #
+######################
+
+
+def test_sparklines_of_series_with_different_lengths():
+    lines = sparklines([np.sin(np.arange(500) / 20), [1, 5, 2], []], width=30)
+
+    assert len(lines) == 3
+    assert all(len(line) == 30 for line in lines)
+    assert lines[2].strip() == ""
+
+
+def test_sparklines_of_a_matrix_with_several_lines_each():
+    lines = sparklines(np.random.rand(4, 100), width=10, height=2)
+
+    assert len(lines) == 4
+    assert all(line.count("\n") == 1 for line in lines)
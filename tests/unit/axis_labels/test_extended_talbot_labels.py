@@ -11,6 +11,20 @@ def test_simple_labeling_case():
     assert 0.0 in ls.labels
 
 
+def test_integer_labels_of_indices():
+    ls = extended_talbot_labels(
+        x_min=-0.5, x_max=2.5, available_space=80, integers=True
+    )
+    assert ls is not None
+    assert np.array_equal(ls.labels, [0.0, 1.0, 2.0])
+
+    # A single index has no two labels
+    assert (
+        extended_talbot_labels(x_min=-0.5, x_max=0.5, available_space=80, integers=True)
+        is None
+    )
+
+
 def test_typical_labeling_case_with_small_range():
     """
     This is the result when plotting [1, 2, 3] using the default settings. We are testing both axis here.
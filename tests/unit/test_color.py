@@ -27,3 +27,8 @@ def test_init_color_from_param_with_hex_values():
 
     assert c.is_enabled()
     assert len(c.colorize("x")) > 1
+
+
+def test_background_color_of_rgb_and_terminal_colors():
+    assert Color.from_rgb(1, 2, 3).enable_background_str() == "\033[48;2;1;2;3m"
+    assert Color.from_terminal("red").enable_background_str() == "\033[41m"
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from uniplot.heatmap_grid import HeatmapGrid
+
+
+def test_events_are_counted_in_log_spaced_rows():
+    grid = HeatmapGrid(width=3, height=3, column_duration=1.0, y_min=1, y_max=1000)
+    grid.add(times=[0.5, 0.5, 1.5, 2.5, 2.5], values=[2, 20, 200, 0.1, 5000])
+
+    assert grid.x_max == 3.0
+    np.testing.assert_array_equal(grid.counts, [[0, 1, 1], [1, 0, 0], [1, 0, 1]])
+
+    grid.add(times=[4.5], values=[np.nan])
+    assert grid.x_max == 3.0
+
+
+def test_grid_scrolls_to_new_events_and_drops_old_ones():
+    grid = HeatmapGrid(width=3, height=1, column_duration=10.0, y_min=1, y_max=10)
+    grid.add(times=[1, 11, 21, 22], values=[5, 5, 5, 5])
+    np.testing.assert_array_equal(grid.counts, [[1, 1, 2]])
+    assert grid.x_max == 30
+
+    grid.add(times=[35, 5], values=[5, 5])
+    np.testing.assert_array_equal(grid.counts, [[1, 2, 1]])
+    assert grid.x_max == 40
+
+    grid.add(times=[1000], values=[5])
+    np.testing.assert_array_equal(grid.counts, [[0, 0, 1]])
+
+
+def test_grid_needs_a_positive_value_range():
+    with pytest.raises(ValueError):
+        HeatmapGrid(width=3, height=3, column_duration=1.0, y_min=0, y_max=10)
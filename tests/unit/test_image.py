@@ -0,0 +1,76 @@
+import numpy as np
+
+from uniplot.image import (
+    canvas_size,
+    colorize,
+    image_surface,
+    resample,
+    FULL_BLOCK,
+    LOWER_HALF_BLOCK,
+    UPPER_HALF_BLOCK,
+)
+
+
+def test_canvas_keeps_the_aspect_ratio_of_square_pixels():
+    assert canvas_size((10, 10), max_width=60, max_height=17) == (34, 17)
+    assert canvas_size((2, 100), max_width=60, max_height=17) == (60, 1)
+    assert canvas_size((10, 10), max_width=60, max_height=17, width=20) == (20, 10)
+    assert canvas_size((10, 10), max_width=60, max_height=17, height=2) == (4, 2)
+
+
+def test_downscaling_averages_the_cells_of_each_pixel_and_ignores_nan():
+    matrix = np.array(
+        [
+            [1.0, 3.0, 5.0, 7.0],
+            [np.nan, 5.0, np.nan, np.nan],
+        ]
+    )
+
+    np.testing.assert_array_equal(resample(matrix, 1, 2), [[3.0, 6.0]])
+    np.testing.assert_array_equal(resample(matrix, 2, 1), [[4.0], [5.0]])
+
+
+def test_upscaling_repeats_cells():
+    np.testing.assert_array_equal(
+        resample([[1, 2]], 2, 4), [[1.0, 1.0, 2.0, 2.0], [1.0, 1.0, 2.0, 2.0]]
+    )
+
+
+def test_colorize_clips_to_the_limits_of_the_color_map():
+    colors = colorize(np.array([-1.0, 0.0, 0.5, 2.0]), 0.0, 1.0, ["#000000", "#ff0000"])
+
+    np.testing.assert_array_equal(
+        colors, [[0, 0, 0], [0, 0, 0], [128, 0, 0], [255, 0, 0]]
+    )
+
+
+def test_colorize_with_terminal_color_names():
+    colors = colorize(np.array([0.0, 1.0]), 0.0, 1.0, ["black", "red"])
+
+    np.testing.assert_array_equal(colors, [[0, 0, 0], [205, 0, 0]])
+
+
+def test_image_surface_uses_half_blocks_for_two_pixels_per_cell():
+    colors = np.array(
+        [
+            [[255, 0, 0], [255, 0, 0], [0, 0, 0], [0, 0, 0]],
+            [[0, 0, 255], [255, 0, 0], [0, 0, 0], [0, 0, 0]],
+        ],
+        dtype=np.uint8,
+    )
+    is_valid = np.array([[True, True, True, False], [True, True, False, False]])
+
+    surface = image_surface(colors, is_valid)
+    characters = surface.to_character_matrix()
+
+    assert surface.glyph_ids.shape == (1, 4)
+    assert characters[0, 0] == (
+        "\033[38;2;255;0;0m\033[48;2;0;0;255m" + UPPER_HALF_BLOCK + "\033[0m"
+    )
+    assert characters[0, 1] == "\033[38;2;255;0;0m" + FULL_BLOCK + "\033[0m"
+    assert characters[0, 2] == "\033[38;2;0;0;0m" + UPPER_HALF_BLOCK + "\033[0m"
+    assert characters[0, 3] == " "
+    assert LOWER_HALF_BLOCK not in surface.rows()[0]
+    # Empty cells need no escape codes
+    assert surface.color_ids[0, 3] == 0
+    assert surface.cells(0, 2, 4).endswith("\033[0m ")
@@ -1,6 +1,18 @@
 import numpy as np
 
-from uniplot.layer_factory import render_points
+from uniplot.layer_factory import (
+    render_points,
+    render_point_density,
+    render_counts,
+    render_sparklines,
+    render_vertical_gridlines,
+    render_horizontal_gridlines,
+    scrolled_columns,
+    scrolling_x_bounds,
+    scroll_pixels,
+    _visible_slice,
+    _search_sorted,
+)
 from uniplot.options import Options, CharacterSet
 from uniplot.colors import Color
 
@@ -11,7 +23,7 @@ def test_ascii_characters_without_color():
     opts = Options(
         character_set=CharacterSet.ASCII, x_min=0.0, x_max=5.0, y_min=0.0, y_max=5.0
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert "+" in matrix
 
 
@@ -26,7 +38,7 @@ def test_ascii_characters_with_terminal_color():
         y_max=5.0,
         color=[Color.from_terminal("red")],
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert _wrap_in_red("+") in matrix
 
 
@@ -43,7 +55,7 @@ def test_ascii_characters_with_rgb_color():
         width=3,
         color=[Color.from_rgb(146, 255, 12)],
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert _wrap_in_lime_green("+") in matrix
 
 
@@ -51,7 +63,7 @@ def test_block_characters_without_color():
     xs = [np.array([0, 5])]
     ys = [np.array([0, 5])]
     opts = Options(x_min=0.0, x_max=5.0, y_min=0.0, y_max=5.0)
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert "▖" in matrix
 
 
@@ -61,7 +73,7 @@ def test_block_characters_with_color():
     opts = Options(
         x_min=0.0, x_max=5.0, y_min=0.0, y_max=5.0, color=[Color.from_terminal("red")]
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert _wrap_in_red("▖") in matrix
 
 
@@ -80,7 +92,7 @@ def test_block_characters_where_the_top_layer_should_hide_the_lower_layer():
         lines=[False, False],
         color=False,
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     # Make sure that the result is the same as in `test_block_characters_without_color`,
     # because the second series overwrites the first one.
     assert "▖" in matrix
@@ -98,7 +110,7 @@ def test_braille_characters_without_color():
         height=3,
         character_set=CharacterSet.BRAILLE,
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     assert "⡀" in matrix
 
 
@@ -115,19 +127,183 @@ def test_braille_characters_with_color():
         character_set=CharacterSet.BRAILLE,
         color=[Color.from_terminal("red")],
     )
-    matrix = render_points(xs, ys, opts)
+    matrix = render_points(xs, ys, opts).to_character_matrix()
     print(matrix)
     assert _wrap_in_red("⡀") in matrix
 
 
+def test_sorted_series_are_rendered_identically_when_cut_to_view():
+    np.random.seed(42)
+    xs = [np.arange(100_000)]
+    ys = [np.cumsum(np.random.normal(size=100_000))]
+    opts = Options(
+        x_min=50_000.0,
+        x_max=50_100.0,
+        y_min=float(ys[0].min()),
+        y_max=float(ys[0].max()),
+        lines=[True],
+    )
+
+    matrix = render_points(xs, ys, opts, x_is_sorted=[True]).to_character_matrix()
+    desired_matrix = render_points(xs, ys, opts).to_character_matrix()
+
+    np.testing.assert_array_equal(matrix, desired_matrix)
+
+
+def test_visible_slice_includes_neighbors_outside_of_the_view():
+    xs = np.arange(100.0)
+
+    visible = _visible_slice(xs, x_min=10.0, x_max=20.0, width=11)
+
+    assert visible == slice(8, 23)
+
+
 ###########
 # private #
 ###########
 
 
+def test_ascii_markers_repeat_for_more_series_than_markers():
+    xs = [np.array([float(i)]) for i in range(12)]
+    ys = [np.array([0.0])] * 12
+    opts = Options(
+        character_set=CharacterSet.ASCII,
+        x_min=0.0,
+        x_max=11.0,
+        y_min=-1.0,
+        y_max=1.0,
+        width=12,
+        height=1,
+        lines=[False] * 12,
+    )
+    assert render_points(xs, ys, opts).rows() == ["+xo*~.+xo*~."]
+
+
 def _wrap_in_red(char: str) -> str:
     return "\033[31m" + str(char) + "\033[0m"
 
 
 def _wrap_in_lime_green(char: str) -> str:
     return "\033[38;2;146;255;12m" + str(char) + "\033[0m"
+
+
+def test_point_density_is_shaded_logarithmically():
+    xs = [np.array([0.1] * 1000 + [2.5] * 9 + [3.9])]
+    ys = [np.full(1010, 0.5)]
+    opts = Options(
+        x_min=0.0, x_max=4.0, y_min=0.0, y_max=1.0, width=4, height=1, density=True
+    )
+
+    surface = render_point_density(xs, ys, opts)
+
+    assert surface.rows() == ["█ ▒░"]
+    assert render_points(xs, ys, opts).rows() == surface.rows()
+
+
+def test_counts_are_shaded_with_ascii_characters():
+    opts = Options(width=4, height=2, character_set=CharacterSet.ASCII, density=True)
+
+    surface = render_counts(np.array([[0, 1, 10, 100], [1000, 0, 0, 0]]), opts)
+
+    assert surface.rows() == [" .:*", "#   "]
+
+
+def test_searching_integers_equals_searching_floats():
+    xs = np.array([-3, 0, 0, 2, 5, 120], dtype=np.int8)
+
+    for value in [-200.0, -3.5, -3.0, 0.0, 0.2, 1.9, 5.0, 127.5, 300.0, np.nan]:
+        for side in ["left", "right"]:
+            assert _search_sorted(xs, value, side=side) == np.searchsorted(  # type: ignore
+                xs.astype(float),
+                value,
+                side=side,  # type: ignore
+            )
+
+
+def test_vertical_gridlines_of_same_column_use_color_of_last_line():
+    red = Color.from_param("red")
+    blue = Color.from_param("blue")
+    opts = Options(
+        character_set=CharacterSet.ASCII,
+        x_min=0.0,
+        x_max=5.0,
+        width=5,
+        height=2,
+        x_gridlines_color=[red, blue],
+    )
+    surface = render_vertical_gridlines(np.array([1.2, 1.5, 3.0, 7.0]), opts)
+
+    assert surface.rows()[0] == (
+        " " + blue.enable_str() + "│\033[0m " + red.enable_str() + "│\033[0m "
+    )
+
+
+def test_thousands_of_horizontal_gridlines():
+    opts = Options(y_min=0.0, y_max=1.0, width=4, height=10)
+    surface = render_horizontal_gridlines(np.linspace(0, 1, 5000), opts)
+
+    assert surface.rows() == ["▔▔▔▔"] * 10
+
+
+def test_scrolled_columns_of_view_moved_by_whole_pixels():
+    previous = Options(x_min=0.0, x_max=9.0, y_min=0.0, y_max=1.0, width=5)
+    options = Options(x_min=2.0, x_max=11.0, y_min=0.0, y_max=1.0, width=5)
+    assert scrolled_columns(previous, options) == 2
+
+    options = Options(x_min=1.5, x_max=10.5, y_min=0.0, y_max=1.0, width=5)
+    assert scrolled_columns(previous, options) is None
+
+    # Odd shifts could move points exactly between two pixels
+    options = Options(x_min=1.0, x_max=10.0, y_min=0.0, y_max=1.0, width=5)
+    assert scrolled_columns(previous, options) is None
+
+    options = Options(x_min=2.0, x_max=11.0, y_min=0.0, y_max=2.0, width=5)
+    assert scrolled_columns(previous, options) is None
+
+
+def test_scrolling_x_bounds_move_by_even_numbers_of_columns():
+    # 9 steps between the 10 pixel columns, so 29 points per column for 200
+    # points, and the view moves in steps of 58 points
+    options = Options(width=5, y_min=0.0, y_max=1.0)
+    previous = Options(width=5, y_min=0.0, y_max=1.0)
+    previous.x_min, previous.x_max = scrolling_x_bounds(200, 1000, options)
+    assert (previous.x_min, previous.x_max) == (783, 1044)
+
+    for last_index in range(1001, 1100):
+        options.x_min, options.x_max = scrolling_x_bounds(200, last_index, options)
+        assert options.x_min <= last_index - 199 and last_index <= options.x_max
+        assert scrolled_columns(previous, options) in (0, 2, 4, 6, 8)
+        previous.x_min, previous.x_max = options.x_min, options.x_max
+
+    # For fewer points than columns, each point is a power of two of columns
+    assert scrolling_x_bounds(3, 10, options) == (7.75, 10)
+
+
+def test_scrolled_pixels_equal_pixels_rendered_from_scratch():
+    xs = np.arange(30.0)
+    ys = np.sin(xs)
+    previous = Options(
+        x_min=0.0, x_max=19.0, y_min=-1.0, y_max=1.0, width=10, height=4, lines=[True]
+    )
+    options = Options(
+        x_min=6.0, x_max=25.0, y_min=-1.0, y_max=1.0, width=10, height=4, lines=[True]
+    )
+    pixels = render_points([xs[:20]], [ys[:20]], previous).pixels
+    assert pixels is not None
+
+    nr_columns = scrolled_columns(previous, options)
+    assert nr_columns is not None
+    (start,) = scroll_pixels(pixels, [xs[5:]], [ys[5:]], options, nr_columns)
+    render_points([xs[5:][start:]], [ys[5:][start:]], options, pixels=pixels)
+
+    expected = render_points([xs[5:]], [ys[5:]], options).pixels
+    np.testing.assert_array_equal(pixels, expected)
+
+
+def test_sparklines_are_rendered_below_each_other():
+    opts = Options(character_set=CharacterSet.BLOCK, width=2, height=1)
+    series = [np.array([0, 1, 2, 3]), np.array([3, 2, 1, 0]), np.array([])]
+
+    characters = render_sparklines(series, opts)
+
+    assert ["".join(row) for row in characters] == ["▟▀", "▜▄", "  "]
@@ -0,0 +1,67 @@
+import numpy as np
+
+from uniplot.min_max_pyramid import MinMaxPyramid, BRANCHING_FACTOR
+from uniplot.pixel_matrix import render
+
+
+def test_levels_contain_index_of_minimum_and_maximum_per_bucket():
+    ys = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0, 3.0])
+    pyramid = MinMaxPyramid(xs=np.arange(len(ys)), ys=ys)
+
+    assert BRANCHING_FACTOR == 8
+    assert len(pyramid.argmins) == 2
+    np.testing.assert_array_equal(pyramid.argmins[0], [1, 9])
+    np.testing.assert_array_equal(pyramid.argmaxs[0], [5, 8])
+    np.testing.assert_array_equal(pyramid.argmins[1], [1])
+    np.testing.assert_array_equal(pyramid.argmaxs[1], [5])
+
+
+def test_empty_index_range_yields_no_points():
+    pyramid = MinMaxPyramid(xs=np.arange(10), ys=np.arange(10))
+
+    assert len(pyramid.visible_indices(5, 5, x_min=0, x_max=10, width=4)) == 0
+
+
+def test_visible_points_render_identical_to_all_points():
+    np.random.seed(42)
+    xs = np.sort(np.random.uniform(0, 100, size=100_000))
+    ys = np.cumsum(np.random.normal(size=len(xs)))
+    pyramid = MinMaxPyramid(xs=xs, ys=ys)
+
+    for x_min, x_max in [(0.0, 100.0), (20.0, 30.0), (42.0, 42.5)]:
+        start = max(int(np.searchsorted(xs, x_min)) - 1, 0)
+        end = min(int(np.searchsorted(xs, x_max, side="right")) + 1, len(xs))
+        kwargs = {
+            "x_min": x_min,
+            "x_max": x_max,
+            "y_min": np.min(ys),
+            "y_max": np.max(ys),
+            "width": 120,
+            "height": 68,
+            "lines": True,
+        }
+
+        indices = pyramid.visible_indices(start, end, x_min, x_max, width=120)
+        pixels = render(xs=xs[indices], ys=ys[indices], **kwargs)  # type: ignore
+        desired_pixels = render(xs=xs[start:end], ys=ys[start:end], **kwargs)  # type: ignore
+
+        np.testing.assert_array_equal(pixels, desired_pixels)
+        assert len(indices) <= end - start
+
+
+def test_large_views_are_reduced_to_few_points():
+    xs = np.arange(1_000_000)
+    ys = np.sin(xs / 1_000)
+    pyramid = MinMaxPyramid(xs=xs, ys=ys)
+
+    indices = pyramid.visible_indices(0, len(xs), x_min=0, x_max=len(xs), width=120)
+
+    assert len(indices) < 10_000
+
+
+def test_pyramid_of_integer_values_keeps_their_type():
+    ys = np.array([3, -1, 4, 1, 5, 9, 2, 6, 5], dtype=np.int16)
+    pyramid = MinMaxPyramid(xs=np.arange(len(ys)), ys=ys)
+
+    np.testing.assert_array_equal(pyramid.argmins[0], [1, 8])
+    np.testing.assert_array_equal(pyramid.argmaxs[0], [5, 8])
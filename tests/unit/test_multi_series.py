@@ -1,6 +1,8 @@
 import numpy as np
+import pytest
 
 from uniplot.multi_series import MultiSeries
+from uniplot.serial_index import SerialIndex
 
 
 def test_length_and_shape_when_only_passing_single_ys_as_list():
@@ -86,3 +88,120 @@ def test_time_series_should_be_detected_as_such():
     series = MultiSeries(xs=dates, ys=ys)
 
     assert series.x_is_time_series
+
+
+def test_time_series_of_strings_should_be_detected_as_such():
+    series = MultiSeries(xs=["2002-10-27", "2002-10-28"], ys=[1, 2])
+
+    assert series.x_is_time_series
+    assert series.xs[0][1] - series.xs[0][0] == 24 * 60 * 60
+
+
+def test_object_series_starting_with_missing_values_should_not_be_time_series():
+    series = MultiSeries(ys=[None] * 10 + [1.0, 2.0, 3.0])
+
+    assert not series.x_is_time_series
+    np.testing.assert_array_equal(series.ys[0][-4:], [np.nan, 1.0, 2.0, 3.0])
+
+    series = MultiSeries(xs=[None] * 10 + ["2002-10-27"], ys=[1] * 11)
+    assert series.x_is_time_series
+
+
+def test_float_arrays_should_not_be_copied():
+    xs = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    ys = np.array([3.0, 1.0, 2.0], dtype=np.float32)
+
+    assert np.shares_memory(MultiSeries(xs=xs, ys=xs).xs[1], xs)
+    assert MultiSeries(ys=ys).ys[0] is ys
+
+
+def test_integer_arrays_should_keep_their_type():
+    ys = np.array([3, 1, 2], dtype=np.int16)
+
+    assert MultiSeries(ys=ys).ys[0] is ys
+    assert MultiSeries(ys=[True, False]).ys[0].dtype == float
+
+
+def test_sorted_x_series_should_be_detected_as_such():
+    xs = [[1, 2, 3], [3, 2, 1], [1, np.nan, 3]]
+    ys = [[1, 2, 3], [1, 2, 3], [1, 2, 3]]
+    series = MultiSeries(xs=xs, ys=ys)
+
+    assert series.x_is_sorted == [True, False, False]
+
+
+def test_serial_index_should_be_sorted():
+    series = MultiSeries(ys=[[3, 1, 2], [5, 4]])
+
+    assert series.x_is_sorted == [True, True]
+
+
+def test_pyramids_are_only_built_for_sorted_series_without_nans():
+    xs = [[1, 2, 3], [3, 2, 1], [1, 2, 3]]
+    ys = [[1, 2, 3], [1, 2, 3], [1, np.nan, 3]]
+    series = MultiSeries(xs=xs, ys=ys)
+    assert series.pyramids == [None, None, None]
+
+    series.build_pyramids()
+
+    assert [p is not None for p in series.pyramids] == [True, False, False]
+
+
+def test_appending_keeps_track_of_sorted_series():
+    series = MultiSeries(xs=[[1, 2], [1, 2]], ys=[[1, 2], [3, 4]])
+    series.append(MultiSeries(xs=[[3, 4], [0, 5]], ys=[[5, 6], [7, 8]]))
+
+    np.testing.assert_array_equal(series.xs[0], [1, 2, 3, 4])
+    np.testing.assert_array_equal(series.ys[1], [3, 4, 7, 8])
+    assert series.x_is_sorted == [True, False]
+
+
+def test_appending_applies_log10_to_new_points():
+    series = MultiSeries(ys=[1, 10])
+    series.set_y_axis_to_log10()
+    series.set_y_axis_to_log10()
+    series.append(MultiSeries(xs=[3], ys=[100]))
+
+    np.testing.assert_array_almost_equal(series.ys[0], [0, 1, 2])
+
+
+def test_appending_a_different_number_of_series_fails():
+    series = MultiSeries(ys=[[1, 2], [3, 4]])
+
+    with pytest.raises(ValueError):
+        series.append(MultiSeries(ys=[5]))
+
+
+def test_bounds_ignore_nan_values_and_series_without_values():
+    series = MultiSeries(xs=[[1, 2, 3], [4, 5]], ys=[[np.nan, -2, 7], [np.nan, np.nan]])
+
+    assert (series.x_min(), series.x_max()) == (1, 5)
+    assert (series.y_min(), series.y_max()) == (-2, 7)
+
+
+def test_bounds_of_series_without_values_fail():
+    with pytest.raises(ValueError):
+        MultiSeries(ys=[np.nan]).y_max()
+
+
+def test_appending_updates_the_bounds():
+    series = MultiSeries(ys=[[1, 2], [3, 4]])
+    assert series.y_max() == 4
+
+    series.append(MultiSeries(xs=[[3], [3]], ys=[[-5], [np.nan]]))
+
+    assert (series.y_min(), series.y_max()) == (-5, 4)
+    assert (series.x_min(), series.x_max()) == (1, 3)
+
+
+def test_serial_index_bounds_and_appending_stay_lazy():
+    series = MultiSeries(ys=np.zeros(5))
+    series.append(MultiSeries(xs=[6, 7], ys=[1, 2]))
+    assert (series.x_min(), series.x_max()) == (1, 7)
+
+    series = MultiSeries(ys=np.zeros(5))
+    new_points = MultiSeries(ys=[1, 2])
+    new_points.xs = [x + 5 for x in new_points.xs]
+    series.append(new_points)
+    assert isinstance(series.xs[0], SerialIndex)
+    np.testing.assert_array_equal(series.xs[0], np.arange(1, 8))
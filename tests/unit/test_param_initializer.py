@@ -1,5 +1,8 @@
+import numpy as np
 import pytest
 
+import uniplot.multi_series
+
 from uniplot.param_initializer import validate_and_transform_options
 from uniplot.multi_series import MultiSeries
 
@@ -28,3 +31,17 @@ def test_invalid_lines_option_with_multiple_lists():
     series = MultiSeries(ys=[[1, 2, 3], [100, 1000, 10000]])
     with pytest.raises(ValueError):
         validate_and_transform_options(series=series, kwargs={"lines": [False]})
+
+
+def test_explicit_bounds_do_not_need_the_bounds_of_the_series(monkeypatch):
+    def fail(_):
+        raise AssertionError("The bounds of the series should not be computed.")
+
+    monkeypatch.setattr(uniplot.multi_series, "_nan_bounds", fail)
+    series = MultiSeries(ys=np.arange(1000.0))
+    options = validate_and_transform_options(
+        series=series, kwargs={"x_min": 1, "x_max": 10, "y_min": 0, "y_max": 5}
+    )
+
+    assert (options.x_min, options.x_max) == (1, 10)
+    assert (options.y_min, options.y_max) == (0, 5)
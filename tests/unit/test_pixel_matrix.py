@@ -1,7 +1,19 @@
 import pytest
 import numpy as np
 
-from uniplot.pixel_matrix import render, merge_on_top
+from uniplot.pixel_matrix import (
+    render,
+    render_layers,
+    count_points,
+    sparkline_spans,
+    merge_on_top,
+    is_sorted,
+    _clip_segments_to_canvas,
+    _decimate_line_points,
+    _expand_segments_along_major_axis,
+    _pixel_coordinates,
+    _rounded_pixel_coordinates,
+)
 
 
 ###################
@@ -404,6 +416,348 @@ def test_should_plot_no_lines_where_nan_values_are():
     np.testing.assert_array_equal(pixels, desired_pixels)
 
 
+def test_lines_far_outside_of_the_view_are_clipped():
+    pixels = render(
+        xs=np.array([-1e12, 1e12]),
+        ys=np.array([1.0, 1.0]),
+        x_min=0,
+        y_min=0,
+        x_max=2,
+        y_max=2,
+        width=5,
+        height=3,
+        lines=True,
+    )
+
+    desired_pixels = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1], [0, 0, 0, 0, 0]])
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+def test_diagonal_line_crossing_the_view_is_clipped():
+    pixels = render(
+        xs=np.array([-1e9, 1e9]),
+        ys=np.array([-1e9, 1e9]),
+        x_min=0,
+        y_min=0,
+        x_max=1,
+        y_max=1,
+        width=3,
+        height=3,
+        lines=True,
+    )
+
+    desired_pixels = np.array([[0, 0, 1], [0, 1, 0], [1, 0, 0]])
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+def test_decimated_lines_are_identical_to_full_render():
+    np.random.seed(42)
+    xs = np.arange(10_000)
+    ys = np.cumsum(np.random.normal(size=len(xs)))
+    ys[[500, 501, 7_000]] = np.nan
+    kwargs = {
+        "x_min": -100,
+        "x_max": 9_000,
+        "y_min": np.nanmin(ys),
+        "y_max": 0.8 * np.nanmax(ys),
+        "width": 50,
+        "height": 30,
+        "lines": True,
+    }
+
+    pixels = render(xs=xs, ys=ys, decimate=True, **kwargs)  # type: ignore
+    desired_pixels = render(xs=xs, ys=ys, decimate=False, **kwargs)  # type: ignore
+
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+def test_time_series_lines_are_identical_to_full_render():
+    np.random.seed(42)
+    xs = np.sort(np.random.uniform(0, 100, size=10_000))
+    ys = np.cumsum(np.random.normal(size=len(xs)))
+    kwargs = {
+        "x_min": 10,
+        "x_max": 90,
+        "y_min": np.min(ys),
+        "y_max": 0.8 * np.max(ys),
+        "width": 50,
+        "height": 30,
+        "lines": True,
+    }
+
+    pixels = render(xs=xs, ys=ys, x_is_sorted=True, **kwargs)  # type: ignore
+    desired_pixels = render(xs=xs, ys=ys, decimate=False, **kwargs)  # type: ignore
+
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+def test_vertical_spans_of_time_series():
+    pixels = render(
+        xs=np.array([0.0, 0.1, 0.2, 1.0, 1.1, 2.0]),
+        ys=np.array([0.0, 3.0, 1.0, 1.0, 2.0, 2.0]),
+        x_min=0,
+        y_min=0,
+        x_max=2,
+        y_max=3,
+        width=3,
+        height=4,
+        lines=True,
+        x_is_sorted=True,
+    )
+
+    desired_pixels = np.array([[1, 0, 0], [1, 1, 1], [1, 1, 0], [1, 0, 0]])
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.uint16, np.int64, np.float32])
+def test_native_types_render_identical_to_float64(dtype):
+    np.random.seed(42)
+    ys = np.random.randint(0, 100, size=5_000).astype(dtype)
+    xs = np.random.randint(0, 100, size=5_000).astype(dtype)
+    kwargs = {
+        "x_min": 10.5,
+        "x_max": 90,
+        "y_min": -3,
+        "y_max": 80,
+        "width": 50,
+        "height": 30,
+    }
+
+    for lines in [False, True]:
+        pixels = render(xs=xs, ys=ys, lines=lines, **kwargs)  # type: ignore
+        desired_pixels = render(
+            xs=xs.astype(float), ys=ys.astype(float), lines=lines, **kwargs
+        )  # type: ignore
+        np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.float32])
+@pytest.mark.parametrize(
+    "value,v_min,v_max",
+    [(-71, -128.6, 101.8), (46, -128.6, 104.2), (-68, -125.8, 105.4)],
+)
+def test_native_types_render_identical_to_float64_on_rounding_ties(
+    dtype, value, v_min, v_max
+):
+    # With these bounds, the value is within rounding error of a tie between
+    # two pixels
+    values = np.array([value], dtype=dtype)
+    zeros = np.zeros_like(values)
+    kwargs = {"x_min": v_min, "x_max": v_max, "y_min": v_min, "y_max": v_max}
+
+    for xs, ys in [(values, zeros), (zeros, values)]:
+        pixels = render(xs=xs, ys=ys, width=3, height=3, **kwargs)  # type: ignore
+        desired_pixels = render(
+            xs=xs.astype(float), ys=ys.astype(float), width=3, height=3, **kwargs
+        )  # type: ignore
+        np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+def test_small_types_use_single_precision_pixel_coordinates():
+    values = np.array([1, 2, 3], dtype=np.int16)
+
+    assert _rounded_pixel_coordinates(values, 0, 3, 4).dtype == np.float32
+    assert _rounded_pixel_coordinates(values.astype(np.int32), 0, 3, 4).dtype == (
+        np.float64
+    )
+    # Far away from zero, single precision is not exact enough
+    assert _rounded_pixel_coordinates(values, 30000, 30001, 100).dtype == np.float64
+    assert _pixel_coordinates(values.astype(np.float32), 0, 3, 4).dtype == np.float64
+
+
+def test_float32_far_from_zero_renders_identical_to_float64():
+    rng = np.random.default_rng(653)
+    xs = np.sort(rng.uniform(0, 100, 2_000)).astype(np.float32) + np.float32(1e5)
+    ys = (rng.normal(size=2_000) * 10 + 1e5).astype(np.float32)
+    kwargs = {
+        "x_min": 1e5,
+        "x_max": 1e5 + 100,
+        "y_min": 1e5 - 25,
+        "y_max": 1e5 + 25,
+        "width": 60,
+        "height": 30,
+    }
+
+    pixels = render(xs=xs, ys=ys, lines=True, **kwargs)  # type: ignore
+    desired_pixels = render(
+        xs=xs.astype(float), ys=ys.astype(float), lines=True, **kwargs
+    )  # type: ignore
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+##########################
+# Testing: render_layers #
+##########################
+
+
+def test_last_series_is_on_top():
+    pixels = render_layers(
+        xs=[np.array([0.0, 1.0]), np.array([1.0, 2.0]), np.array([0.0])],
+        ys=[np.array([0.0, 0.0]), np.array([0.0, 0.0]), np.array([0.0])],
+        x_min=0,
+        x_max=2,
+        y_min=0,
+        y_max=1,
+        width=3,
+        height=1,
+        lines=[False, False, False],
+    )
+
+    np.testing.assert_array_equal(pixels, [[3, 2, 2]])
+
+
+def test_lines_do_not_connect_different_series():
+    pixels = render_layers(
+        xs=[np.array([2.0, 0.0]), np.array([0.0, 2.0])],
+        ys=[np.array([0.0, 2.0]), np.array([1.0, 1.0])],
+        x_min=0,
+        x_max=2,
+        y_min=0,
+        y_max=2,
+        width=3,
+        height=3,
+        lines=[False, True],
+        layers=[4, 7],
+    )
+
+    np.testing.assert_array_equal(pixels, [[4, 0, 0], [7, 7, 7], [0, 0, 4]])
+
+
+@pytest.mark.parametrize("lines", [False, True])
+def test_rendering_all_series_at_once_equals_rendering_them_in_turn(lines):
+    rng = np.random.default_rng(seed=7)
+    xs = [np.sort(rng.normal(size=n)) for n in [1, 40, 300, 2]]
+    xs += [rng.normal(size=n) for n in [0, 50, 5000]]
+    ys = [rng.normal(size=len(x)).cumsum() for x in xs]
+    ys[2][10] = np.nan
+    bounds = {
+        "x_min": -2,
+        "x_max": 2,
+        "y_min": -3,
+        "y_max": 3,
+        "width": 40,
+        "height": 20,
+    }
+
+    pixels = render_layers(
+        xs=xs, ys=ys, lines=[lines] * len(xs), batch_size=100, **bounds
+    )
+
+    desired_pixels = np.zeros((20, 40), dtype=np.int32)
+    for layer, (x, y) in enumerate(zip(xs, ys), start=1):
+        desired_pixels = render(
+            xs=x, ys=y, lines=lines, pixels=desired_pixels, layer=layer, **bounds
+        )
+    np.testing.assert_array_equal(pixels, desired_pixels)
+
+
+#########################
+# Testing: count_points #
+#########################
+
+
+def test_count_points_per_pixel():
+    counts = count_points(
+        xs=np.array([0.0, 0.0, 1.0, 1.0, 1.0, np.nan, 5.0]),
+        ys=np.array([0.0, 0.0, 1.0, 1.0, 0.0, 1.0, 0.0]),
+        x_min=0,
+        x_max=1,
+        y_min=0,
+        y_max=1,
+        width=2,
+        height=2,
+        batch_size=3,
+    )
+
+    np.testing.assert_array_equal(counts, [[0, 2], [2, 1]])
+
+
+######################
+# Testing: is_sorted #
+######################
+
+
+def test_sorted_values_are_detected_as_such():
+    assert is_sorted(np.array([1.0, 2.0, 2.0, 3.0]))
+    assert is_sorted(np.array([1.0]))
+    assert not is_sorted(np.array([1.0, 3.0, 2.0]))
+    assert not is_sorted(np.array([1.0, np.nan, 3.0]))
+
+
+##################################
+# Testing: _decimate_line_points #
+##################################
+
+
+def test_decimation_keeps_first_min_max_and_last_point_per_column():
+    xs = np.array([0.0, 0.1, 0.2, 0.3, 0.4, 1.0, 1.1, 1.2, 1.3, 1.4])
+    ys = np.array([5.0, 1.0, 9.0, 2.0, 3.0, 4.0, 4.0, 0.0, 4.0, 6.0])
+
+    indices = _decimate_line_points(xs=xs, ys=ys, x_min=0.0, x_max=1.0, width=2)
+
+    np.testing.assert_array_equal(indices, [0, 1, 2, 4, 5, 7, 9])
+
+
+def test_decimation_keeps_nan_values_as_line_breaks():
+    xs = np.linspace(0.0, 1.0, 16)
+    ys = np.array([5.0, 1.0, 9.0, np.nan, 3.0, 4.0, 4.0, 0.0, 4.0, 6.0] + [5.0] * 6)
+
+    indices = _decimate_line_points(xs=xs, ys=ys, x_min=0.0, x_max=10.0, width=2)
+
+    np.testing.assert_array_equal(indices, [0, 1, 2, 3, 4, 7, 9, 15])
+
+
+#####################################
+# Testing: _clip_segments_to_canvas #
+#####################################
+
+
+def test_segments_outside_of_the_canvas_are_dropped():
+    x0, y0, x1, y1, _ = _clip_segments_to_canvas(
+        x0=np.array([-50.0, 20.0, 0.0]),
+        y0=np.array([0.0, 0.0, -50.0]),
+        x1=np.array([-10.0, 30.0, 5.0]),
+        y1=np.array([5.0, 5.0, -20.0]),
+        width=10,
+        height=10,
+    )
+
+    assert len(x0) == len(y0) == len(x1) == len(y1) == 0
+
+
+def test_segments_are_trimmed_to_the_canvas_including_margin():
+    x0, y0, x1, y1, _ = _clip_segments_to_canvas(
+        x0=np.array([-100.0, 5.0]),
+        y0=np.array([5.0, 5.0]),
+        x1=np.array([100.0, 6.0]),
+        y1=np.array([5.0, 6.0]),
+        width=10,
+        height=10,
+    )
+
+    np.testing.assert_array_almost_equal(x0, [-1.0, 5.0])
+    np.testing.assert_array_almost_equal(x1, [10.0, 6.0])
+    np.testing.assert_array_almost_equal(y0, [5.0, 5.0])
+    np.testing.assert_array_almost_equal(y1, [5.0, 6.0])
+
+
+##############################################
+# Testing: _expand_segments_along_major_axis #
+##############################################
+
+
+def test_segments_of_different_length_are_expanded_without_padding():
+    major, minor, _ = _expand_segments_along_major_axis(
+        major0=np.array([0.0, 5.0, 2.0]),
+        minor0=np.array([0.0, 1.0, 3.0]),
+        major1=np.array([3.0, 4.0, 2.0]),
+        minor1=np.array([3.0, 1.0, 3.0]),
+    )
+
+    np.testing.assert_array_equal(major, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 2.0])
+    np.testing.assert_array_equal(minor, [0.0, 1.0, 2.0, 3.0, 1.0, 1.0, 3.0])
+
+
 #########################
 # Testing: merge_on_top #
 #########################
@@ -454,3 +808,37 @@ def test_merge_without_shadow_bigger_patch():
     result = merge_on_top(low_layer=low_layer, high_layer=high_layer, width=3, height=3)
 
     np.testing.assert_array_equal(result, desired_layer)
+
+
+def test_sparkline_spans_connect_the_columns_of_each_series():
+    lows, highs = sparkline_spans(
+        [np.array([0, 1, 2, 3]), np.array([5.0]), np.array([])], width=4, height=4
+    )
+
+    np.testing.assert_array_equal(lows[0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(highs[0], [1, 2, 3, 3])
+    # Constant series are centered, and empty ones are blank
+    np.testing.assert_array_equal(lows[1], [1, 1, 1, 1])
+    np.testing.assert_array_equal(highs[1], [1, 1, 1, 1])
+    assert np.isnan(lows[2]).all() and np.isnan(highs[2]).all()
+
+
+def test_sparkline_spans_cover_the_range_of_each_column():
+    lows, highs = sparkline_spans(
+        [np.array([0, 8, 4, 4, 2, 2, 1, 1])], width=4, height=9
+    )
+
+    np.testing.assert_array_equal(lows, [[0, 2, 1, 1]])
+    np.testing.assert_array_equal(highs, [[8, 4, 2, 1]])
+
+
+def test_sparkline_spans_skip_nan_values():
+    lows, highs = sparkline_spans(
+        [np.array([np.nan, np.nan]), np.array([3.0, 3.0, np.nan, np.nan])],
+        width=4,
+        height=4,
+    )
+
+    assert np.isnan(lows[0]).all() and np.isnan(highs[0]).all()
+    np.testing.assert_array_equal(lows[1], [1, 1, np.nan, np.nan])
+    np.testing.assert_array_equal(highs[1], [1, 1, np.nan, np.nan])
@@ -1,4 +1,11 @@
-from uniplot.plot_elements import legend, plot_title, count_lines
+from uniplot.plot_elements import (
+    legend,
+    plot_title,
+    count_lines,
+    redraw_lines,
+    cell_updates,
+)
+from uniplot.surface import Surface
 from uniplot.legend_placements import LegendPlacement
 
 
@@ -46,6 +53,21 @@ def test_legend_labels_in_vertical_mode():
     assert len(result.splitlines()) == 3
 
 
+def test_many_legend_labels_fill_each_line():
+    label_strings = [f"host {i:03d}" for i in range(300)]
+    result = legend(
+        legend_labels=label_strings,
+        width=60,
+        line_length_hard_cap=False,
+        color=False,
+        legend_placement=LegendPlacement.AUTO,
+    )
+    lines = result.splitlines()
+    # Each label takes 11 characters, and 3 more to separate it
+    assert len(lines) == 75
+    assert all(line.count("host") == 4 for line in lines)
+
+
 #######################
 # Testing: plot_title #
 #######################
@@ -92,3 +114,48 @@ def test_counting_multiple_lines():
 def test_counting_multiple_lines_with_ending_whitespace():
     text = "Hello Bob\nThe weather \r\n"
     assert count_lines(text) == 3
+
+
+#########################
+# Testing: redraw_lines #
+#########################
+
+
+def test_redraw_only_changed_lines():
+    output = redraw_lines(["a", "b", "c", "d"], ["a", "x", "c", "d"])
+
+    assert output == "\x1b[?2026h\x1b[4A\x1b[1B\x1b[2Kx\n\x1b[2B\x1b[?2026l"
+
+
+def test_redraw_erases_lines_left_below():
+    output = redraw_lines(["a", "b", "c"], ["a"])
+
+    assert output == "\x1b[?2026h\x1b[3A\x1b[1B\x1b[2K\n\x1b[2K\n\x1b[2A\x1b[?2026l"
+
+
+def test_redraw_uses_shorter_line_update():
+    output = redraw_lines(["a", "bbbbbb"], ["a", "bbxbbb"], {1: "\x1b[3Gx\r"})
+
+    assert output == "\x1b[?2026h\x1b[2A\x1b[1B\x1b[3Gx\r\x1b[1B\x1b[?2026l"
+
+
+#########################
+# Testing: cell_updates #
+#########################
+
+
+def test_cell_updates_of_changed_cells():
+    previous_surface = Surface.blank(width=12, height=2, glyphs=["+"], colors=[])
+    surface = Surface.blank(width=12, height=2, glyphs=["+"], colors=[])
+    surface.draw(rows=1, columns=[1, 2, 10], glyph_ids=surface.glyph_id("+"))
+
+    updates = cell_updates(previous_surface, surface, column_offset=1)
+
+    assert updates == {1: "\x1b[3G++\x1b[12G+\r"}
+
+
+def test_no_cell_updates_for_different_glyph_tables():
+    previous_surface = Surface.blank(width=3, height=2, glyphs=["+"], colors=[])
+    surface = Surface.blank(width=3, height=2, glyphs=["x"], colors=[])
+
+    assert cell_updates(previous_surface, surface, column_offset=1) == {}
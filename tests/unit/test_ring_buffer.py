@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from uniplot.ring_buffer import RingBuffer
+
+
+def test_ring_buffer_keeps_the_most_recent_values():
+    ring = RingBuffer(3)
+    ring.extend([1, 2])
+    assert list(ring) == [1, 2]
+
+    ring.extend([3, 4, 5, 6, 7])
+    ring.append(8)
+    assert list(ring.values()) == [6, 7, 8]
+    assert len(ring) == 3
+    assert ring.nr_appended == 8
+
+
+def test_ring_buffer_values_are_a_read_only_view():
+    ring = RingBuffer(4)
+    ring.extend(np.arange(6))
+    values = ring.values()
+
+    assert values.flags.c_contiguous
+    assert not values.flags.writeable
+    np.testing.assert_array_equal(np.asarray(ring), [2, 3, 4, 5])
+
+
+def test_ring_buffer_index_continues_with_appended_values():
+    ring = RingBuffer(3)
+    ring.extend([5, 6, 7, 8])
+    np.testing.assert_array_equal(ring.index(), [2, 3, 4])
+
+
+def test_ring_buffer_needs_a_positive_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
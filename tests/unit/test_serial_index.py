@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from uniplot.serial_index import SerialIndex
+
+
+def test_serial_index_behaves_like_an_array():
+    index = SerialIndex(start=1, length=5)
+
+    np.testing.assert_array_equal(index, [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(index * 2.0, [2, 4, 6, 8, 10])
+    np.testing.assert_array_equal(index[np.array([0, -1])], [1, 5])
+    np.testing.assert_array_equal(index[np.array([1, 2]) > 0], [1, 2])
+    assert index[-1] == 5
+    assert (index.min(), index.max()) == (1, 5)
+
+
+def test_slices_and_shifts_of_serial_index_stay_lazy():
+    index = SerialIndex(start=1, length=10)
+
+    assert isinstance(index[2:5], SerialIndex)
+    np.testing.assert_array_equal(index[2:5], [3, 4, 5])
+    np.testing.assert_array_equal(index + 10, np.arange(11, 21))
+    assert isinstance(index + 10, SerialIndex)
+
+
+def test_searching_a_serial_index_equals_searching_the_array():
+    index = SerialIndex(start=3, length=10)
+    values = [-1, 3, 4.5, 12, 12.5, 20, np.nan]
+
+    for side in ["left", "right"]:
+        np.testing.assert_array_equal(
+            np.searchsorted(index, values, side=side),
+            np.searchsorted(np.asarray(index), values, side=side),
+        )
+        for value in values + [-np.inf, np.inf]:
+            assert index.searchsorted(value, side=side) == np.searchsorted(
+                np.asarray(index), value, side=side
+            )
+
+
+def test_serial_index_out_of_bounds():
+    with pytest.raises(IndexError):
+        SerialIndex(start=1, length=3)[3]
@@ -0,0 +1,76 @@
+import numpy as np
+
+from uniplot.colors import Color
+from uniplot.surface import Surface, _decoder
+
+
+def test_blank_surface_renders_spaces():
+    surface = Surface.blank(width=3, height=2, glyphs=["+"], colors=[])
+
+    assert surface.glyph_ids.shape == (2, 3)
+    assert surface.rows() == ["   ", "   "]
+
+
+def test_glyphs_and_colors_are_looked_up():
+    red = Color.from_param("red")
+    surface = Surface.blank(width=3, height=1, glyphs=["+", "x"], colors=[red, red])
+    surface.glyph_ids[0, 1] = surface.glyph_id("x")
+    surface.color_ids[0, 1] = surface.color_id(red)
+    surface.glyph_ids[0, 2] = surface.glyph_id("+")
+
+    assert surface.colors == ("", red.enable_str())
+    np.testing.assert_array_equal(
+        surface.to_character_matrix(),
+        [[" ", red.enable_str() + "x" + "\033[0m", "+"]],
+    )
+
+
+def test_blank_cells_are_never_colored():
+    red = Color.from_param("red")
+    surface = Surface.blank(width=2, height=1, glyphs=["+"], colors=[red])
+    surface.color_ids[:] = surface.color_id(red)
+
+    assert surface.rows() == ["  "]
+
+
+def test_higher_priority_stays_on_top():
+    surface = Surface.blank(width=3, height=1, glyphs=["+", "x"], colors=[])
+    surface.draw(rows=0, columns=[0, 1], glyph_ids=surface.glyph_id("+"), priority=2)
+    surface.draw(rows=0, columns=[1, 2], glyph_ids=surface.glyph_id("x"), priority=1)
+
+    assert surface.rows() == ["++x"]
+
+
+def test_equal_priority_draws_last_on_top():
+    surface = Surface.blank(width=3, height=1, glyphs=["+", "x"], colors=[])
+    surface.draw(rows=0, columns=[0, 1], glyph_ids=surface.glyph_id("+"), priority=1)
+    surface.draw(rows=0, columns=[1, 2], glyph_ids=surface.glyph_id("x"), priority=1)
+
+    assert surface.rows() == ["+xx"]
+
+
+def test_decoder_is_shared_between_surfaces_of_same_tables():
+    red = Color.from_param("red")
+    surface = Surface.blank(width=2, height=1, glyphs=["+"], colors=[red])
+    other_surface = Surface.blank(width=4, height=3, glyphs=["+"], colors=[red])
+    _decoder.cache_clear()
+    surface.rows()
+    other_surface.rows()
+
+    assert _decoder.cache_info().misses == 1
+
+
+def test_runs_of_same_color_share_escape_codes():
+    red = Color.from_param("red")
+    blue = Color.from_param("blue")
+    surface = Surface.blank(width=6, height=1, glyphs=["+"], colors=[red, blue])
+    surface.draw(
+        rows=0,
+        columns=[0, 1, 3, 5],
+        glyph_ids=surface.glyph_id("+"),
+        color_ids=[surface.color_id(c) for c in [red, red, red, blue]],
+    )
+
+    assert surface.rows() == [
+        red.enable_str() + "++ +\033[0m " + blue.enable_str() + "+\033[0m"
+    ]
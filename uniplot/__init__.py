@@ -6,6 +6,22 @@ from uniplot.uniplot import (
     plot_to_string,
     histogram,
     histogram_to_string,
+    imshow,
+    imshow_to_string,
+    sparklines,
 )
+from uniplot.ring_buffer import RingBuffer
+from uniplot.heatmap_grid import HeatmapGrid
 
-__all__ = ["plot", "plot_gen", "plot_to_string", "histogram", "histogram_to_string"]
+__all__ = [
+    "plot",
+    "plot_gen",
+    "plot_to_string",
+    "histogram",
+    "histogram_to_string",
+    "imshow",
+    "imshow_to_string",
+    "sparklines",
+    "RingBuffer",
+    "HeatmapGrid",
+]
@@ -22,12 +22,16 @@ def extended_talbot_labels(
     unit: str = "",
     log: bool = False,
     verbose: bool = False,
+    integers: bool = False,
 ) -> Optional[LabelSet]:
     """
     The following is based on the paper Talbot, J., Lin, S. & Hanrahan, P. An
     Extension of Wilkinson’s Algorithm for Positioning Tick Labels on Axes.
     IEEE T Vis Comput Gr 16, 1036–1043 (2010). We have further exteded the
     algorithm to account for the discrete nature of terminal output.
+
+    With `integers`, only labels at whole numbers are considered, for instance
+    for indices.
     """
     result: Optional[LabelSet] = None
     best_score: float = -2.0
@@ -49,12 +53,13 @@ def extended_talbot_labels(
             # i is the index of the currently selected "nice" number q
             for i, q in enumerate(Q_VALUES):
                 step_size = q * j
+                step = step_size * 10**exponent
+                if integers:
+                    if step < 1 or not np.isclose(step, round(step)):
+                        continue
+                    step = round(step)
 
-                labels = np.arange(
-                    start=label_start,
-                    stop=x_max,
-                    step=step_size * 10**exponent,
-                )
+                labels = np.arange(start=label_start, stop=x_max, step=step)
                 # Crop labels
                 labels = labels[(labels >= x_min) & (labels <= x_max)]
                 if len(labels) < 2:
@@ -2,6 +2,9 @@ from enum import Enum
 from typing import List, Final
 
 ASCII_CHARACTER_SET: Final[List[str]] = ["+", "x", "o", "*", "~", "."]
+# Shades of increasing density, for the `density` option
+DENSITY_CHARACTER_SET: Final[List[str]] = ["░", "▒", "▓", "█"]
+ASCII_DENSITY_CHARACTER_SET: Final[List[str]] = [".", ":", "*", "#"]
 UNICODE_CHARACTER_SET: Final[List[str]] = [
     "",
     "▘",
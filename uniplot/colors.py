@@ -13,6 +13,19 @@ ANSI_COLOR_CODES: Final = {
     "black": "\033[30m",
     "white": "\033[37m",
 }
+# The RGB values of the terminal colors in xterm, for where a terminal color
+# needs to be mixed with other colors
+# Ref.: https://en.wikipedia.org/wiki/ANSI_escape_code#3-bit_and_4-bit
+TERMINAL_COLOR_RGB: Final = {
+    "blue": (0, 0, 238),
+    "magenta": (205, 0, 205),
+    "green": (0, 205, 0),
+    "yellow": (205, 205, 0),
+    "cyan": (0, 205, 205),
+    "red": (205, 0, 0),
+    "black": (0, 0, 0),
+    "white": (229, 229, 229),
+}
 DEFAULT_COLORS_NAMES: Final = list(ANSI_COLOR_CODES.keys())
 DEFAULT_COLORS: Final = list(ANSI_COLOR_CODES.values())
 
@@ -84,6 +97,12 @@ class Color:
         r, g, b = self.rgb  # type: ignore
         return f"\033[38;2;{r};{g};{b}m"
 
+    def enable_background_str(self) -> str:
+        if self.terminal_color:
+            return ANSI_COLOR_CODES[self.terminal_color].replace("[3", "[4", 1)
+        r, g, b = self.rgb  # type: ignore
+        return f"\033[48;2;{r};{g};{b}m"
+
     @staticmethod
     def _clip_to_valid_int(x) -> int:
         if x < 0 or x > 255:
@@ -0,0 +1,127 @@
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Dict, Optional
+
+from uniplot.multi_series import MultiSeries
+
+
+class HeatmapGrid:
+    """
+    The number of events in a grid of time columns and logarithmically spaced
+    value rows, for instance to show the latency of requests over time.
+
+    Each of the `width` columns covers `column_duration` of time, in seconds
+    for datetimes, and each of the `height` rows a constant factor between
+    `y_min` and `y_max`. Values outside of that range are counted in the top
+    and bottom row, respectively.
+
+    The grid always covers the most recent columns: when events arrive after
+    the last column, the grid scrolls and the oldest columns are dropped. Only
+    the counts are kept, so memory use does not depend on the number of
+    events.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        column_duration: float,
+        y_min: float,
+        y_max: float,
+    ) -> None:
+        if width < 1 or height < 1:
+            raise ValueError("A heatmap grid needs at least one row and column.")
+        if column_duration <= 0:
+            raise ValueError("The column duration must be positive.")
+        if not 0 < y_min < y_max:
+            raise ValueError("The value range must be positive and not empty.")
+        self.width: int = width
+        self.height: int = height
+        self.column_duration: float = float(column_duration)
+        self.y_min: float = float(y_min)
+        self.y_max: float = float(y_max)
+        # The counts per cell, where the first row holds the highest values
+        self.counts: NDArray = np.zeros((height, width), dtype=np.int64)
+        # The end of the last column, which is set by the first event
+        self.x_max: Optional[float] = None
+        self.x_is_time_series: bool = False
+
+    def add(self, times: Any, values: Any) -> None:
+        """
+        Count events with the given `times` and `values`. Events with NaN
+        values or from before the first column are ignored.
+        """
+        events = MultiSeries(xs=times, ys=values)
+        if self.x_max is not None and events.x_is_time_series != self.x_is_time_series:
+            raise ValueError("Cannot add events with a different type of times.")
+        self.x_is_time_series = events.x_is_time_series
+        ts, vs = events.xs[0], events.ys[0]
+        valid = ~np.isnan(ts) & ~np.isnan(vs)
+        ts, vs = ts[valid], vs[valid]
+        if len(ts) == 0:
+            return
+
+        x_max = self._scroll_to(float(ts.max()))
+        x_min = x_max - self.width * self.column_duration
+        columns = np.floor((ts - x_min) / self.column_duration).astype(int)
+        with np.errstate(divide="ignore"):
+            rows = np.floor(
+                self.height
+                * np.log(np.clip(vs, self.y_min, self.y_max) / self.y_min)
+                / np.log(self.y_max / self.y_min)
+            )
+        rows = self.height - 1 - np.minimum(rows, self.height - 1).astype(int)
+
+        in_grid = columns >= 0
+        self.counts += np.bincount(
+            rows[in_grid] * self.width + columns[in_grid],
+            minlength=self.width * self.height,
+        ).reshape(self.height, self.width)
+
+    def plot_arguments(self) -> Dict[str, Any]:
+        """
+        Returns the arguments for `plot_gen` that show the area of the grid,
+        with the grid cells as character cells.
+        """
+        x_max = self.x_max
+        if x_max is None:
+            x_max = self.width * self.column_duration
+        x_min = x_max - self.width * self.column_duration
+        xs: Any = np.array([x_min, x_max])
+        if self.x_is_time_series:
+            xs = xs.astype(np.int64).astype("datetime64[s]")
+        return {
+            "xs": xs,
+            "ys": [self.y_min, self.y_max],
+            "x_min": x_min,
+            "x_max": x_max,
+            "y_min": self.y_min,
+            "y_max": self.y_max,
+            "y_as_log": True,
+            "width": self.width,
+            "height": self.height,
+            "density": True,
+        }
+
+    ###########
+    # private #
+    ###########
+
+    def _scroll_to(self, time: float) -> float:
+        """
+        Scroll the grid such that its last column contains the `time`, if it
+        is later than the last column. Returns the end of the last column.
+        """
+        if self.x_max is None:
+            self.x_max = float(
+                (np.floor(time / self.column_duration) + 1) * self.column_duration
+            )
+            return self.x_max
+        if time < self.x_max:
+            return self.x_max
+        shift = int((time - self.x_max) // self.column_duration) + 1
+        if shift < self.width:
+            self.counts[:, :-shift] = self.counts[:, shift:]
+        self.counts[:, -shift:] = 0
+        self.x_max += shift * self.column_duration
+        return self.x_max
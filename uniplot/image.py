@@ -0,0 +1,218 @@
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from uniplot.colors import Color, TERMINAL_COLOR_RGB
+from uniplot.surface import Surface
+
+# Colors of the color maps at equally spaced values, from low to high
+# Ref.: https://matplotlib.org/stable/users/explain/colors/colormaps.html
+COLOR_MAPS: Final[Dict[str, List[Tuple[int, int, int]]]] = {
+    "viridis": [
+        (68, 1, 84),
+        (71, 44, 122),
+        (59, 81, 139),
+        (44, 113, 142),
+        (33, 144, 141),
+        (39, 173, 129),
+        (92, 200, 99),
+        (170, 220, 50),
+        (253, 231, 37),
+    ],
+    "magma": [
+        (0, 0, 4),
+        (28, 16, 68),
+        (79, 18, 123),
+        (129, 37, 129),
+        (181, 54, 122),
+        (229, 80, 100),
+        (251, 135, 97),
+        (254, 194, 135),
+        (252, 253, 191),
+    ],
+    "gray": [(0, 0, 0), (255, 255, 255)],
+}
+COLOR_MAP_SIZE: Final = 256
+UPPER_HALF_BLOCK: Final = "▀"
+LOWER_HALF_BLOCK: Final = "▄"
+FULL_BLOCK: Final = "█"
+
+
+def canvas_size(
+    shape: Tuple[int, int],
+    max_width: int,
+    max_height: int,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Returns the width and height in characters of the canvas for an image of
+    the given `shape`. Every character cell holds two square pixels on top of
+    each other.
+
+    If neither `width` nor `height` is given, the image is scaled to fit into
+    `max_width` and `max_height` while keeping its aspect ratio. If only one of
+    them is given, the other one follows from the aspect ratio.
+    """
+    nr_rows, nr_columns = shape
+    if width is not None and height is not None:
+        return width, height
+    if width is not None:
+        scale = width / nr_columns
+    elif height is not None:
+        scale = 2 * height / nr_rows
+    else:
+        scale = min(max_width / nr_columns, 2 * max_height / nr_rows)
+    if width is None:
+        width = max(round(scale * nr_columns), 1)
+    if height is None:
+        height = max(round(scale * nr_rows / 2), 1)
+    return width, height
+
+
+def resample(matrix: NDArray, nr_rows: int, nr_columns: int) -> NDArray:
+    """
+    Returns the `matrix` resampled to the given number of rows and columns.
+
+    When downscaling, every pixel is the mean of the cells that fall into it,
+    ignoring NaN values. When upscaling, cells are repeated.
+    """
+    values = np.asarray(matrix, dtype=float)
+    is_valid = ~np.isnan(values)
+    sums = np.where(is_valid, values, 0.0)
+    counts = is_valid.astype(int)
+    for axis, size in enumerate([nr_rows, nr_columns]):
+        sums = _sum_per_pixel(sums, size, axis=axis)
+        counts = _sum_per_pixel(counts, size, axis=axis)
+    with np.errstate(invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def colorize(
+    values: NDArray,
+    v_min: float,
+    v_max: float,
+    color_map: Any = "viridis",
+) -> NDArray:
+    """
+    Returns the RGB color of each of the `values` as an array of `uint8` with
+    an extra last axis of size 3. Values outside of `v_min` and `v_max` get
+    the color of the limit.
+
+    The `color_map` is either the name of one of the `COLOR_MAPS` or a list of
+    colors at equally spaced values, in any format that `Color` accepts.
+    """
+    table = _color_table(color_map)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fractions = (values - v_min) / (v_max - v_min) if v_max > v_min else 0 * values
+    indices = np.round(np.clip(np.nan_to_num(fractions), 0, 1) * (len(table) - 1))
+    return table[indices.astype(np.intp)]
+
+
+def image_surface(colors: NDArray, is_valid: NDArray) -> Surface:
+    """
+    Returns the surface with the pixel `colors`, drawn as half blocks with two
+    pixels on top of each other per character cell. The number of pixel rows
+    must be even. Pixels that are not valid are left blank, and cells with
+    two pixels of the same color are drawn as full blocks.
+    """
+    # One key per pixel, with 0 for blank pixels
+    keys = np.where(
+        is_valid,
+        1
+        + (colors[..., 0].astype(np.int64) << 16)
+        + (colors[..., 1].astype(np.int64) << 8)
+        + colors[..., 2],
+        0,
+    )
+    cell_keys = (keys[0::2] << 25) + keys[1::2]
+    unique_keys, inverse = np.unique(cell_keys, return_inverse=True)
+
+    # Empty image cells are drawn as a space of their own, such that they do
+    # not join the runs of colored neighbors
+    glyphs = (" ", UPPER_HALF_BLOCK, LOWER_HALF_BLOCK, FULL_BLOCK, " ")
+    glyph_table = np.zeros(len(unique_keys), dtype=np.uint16)
+    color_table = [""]
+    for i, key in enumerate(unique_keys.tolist()):
+        top, bottom = _key_color(key >> 25), _key_color(key & (2**25 - 1))
+        if top is not None and top == bottom:
+            glyph_table[i] = 3
+            color_table.append(top.enable_str())
+        elif top is not None:
+            glyph_table[i] = 1
+            color_table.append(
+                top.enable_str()
+                + (bottom.enable_background_str() if bottom is not None else "")
+            )
+        elif bottom is not None:
+            glyph_table[i] = 2
+            color_table.append(bottom.enable_str())
+        else:
+            glyph_table[i] = 4
+            color_table.append("")
+
+    inverse = inverse.reshape(cell_keys.shape)
+    glyph_ids = glyph_table[inverse]
+    return Surface(
+        glyph_ids=glyph_ids,
+        # Empty cells have no color, so they need no escape codes
+        color_ids=np.where(glyph_ids == 4, 0, inverse + 1).astype(np.uint16),
+        priorities=np.zeros(cell_keys.shape, dtype=np.uint8),
+        glyphs=glyphs,
+        colors=tuple(color_table),
+    )
+
+
+###########
+# private #
+###########
+
+
+def _sum_per_pixel(values: NDArray, size: int, axis: int) -> NDArray:
+    """
+    Returns the sums of the cells of every pixel along one `axis` of the given
+    `size`.
+    """
+    length = values.shape[axis]
+    # First cell of every pixel. When upscaling, consecutive pixels start at
+    # the same cell, for which `reduceat` returns just that cell.
+    starts = np.arange(size) * length // size
+    return np.add.reduceat(values, starts, axis=axis)
+
+
+def _color_table(color_map: Any) -> NDArray:
+    """
+    Returns the table of `COLOR_MAP_SIZE` RGB colors of the `color_map`.
+    """
+    if isinstance(color_map, str):
+        if color_map not in COLOR_MAPS:
+            raise ValueError(f"Unknown color map: '{color_map}'")
+        anchors = np.array(COLOR_MAPS[color_map], dtype=float)
+    else:
+        colors = [Color.from_param(color) for color in color_map]
+        if len(colors) < 2 or not all(color.is_enabled() for color in colors):
+            raise ValueError("A color map needs at least two colors.")
+        anchors = np.array([_color_rgb(color) for color in colors], dtype=float)
+
+    positions = np.linspace(0, 1, COLOR_MAP_SIZE)
+    anchor_positions = np.linspace(0, 1, len(anchors))
+    channels = [np.interp(positions, anchor_positions, anchors[:, i]) for i in range(3)]
+    return np.round(np.stack(channels, axis=-1)).astype(np.uint8)
+
+
+def _color_rgb(color: Color) -> Tuple[int, int, int]:
+    """
+    Returns the RGB value of the `color`, where terminal colors are mixed by
+    their usual RGB values.
+    """
+    if color.terminal_color is not None:
+        return TERMINAL_COLOR_RGB[color.terminal_color]
+    assert color.rgb is not None
+    return color.rgb
+
+
+def _key_color(key: int) -> Optional[Color]:
+    if key == 0:
+        return None
+    key -= 1
+    return Color(rgb=(key >> 16, (key >> 8) & 255, key & 255))
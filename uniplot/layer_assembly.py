@@ -1,33 +1,61 @@
 from numpy.typing import NDArray
-from typing import List
+from typing import List, Optional, Final
 
 from uniplot.options import Options
+from uniplot.min_max_pyramid import MinMaxPyramid
+from uniplot.surface import Surface
 import uniplot.layer_factory as layer_factory
 
+# Elements with higher priority are drawn on top
+Y_GRIDLINE_PRIORITY: Final = 1
+X_GRIDLINE_PRIORITY: Final = 2
+POINTS_PRIORITY: Final = 3
+
 
 def assemble_scatter_plot(
-    xs: List[NDArray], ys: List[NDArray], options: Options
-) -> NDArray:
+    xs: List[NDArray],
+    ys: List[NDArray],
+    options: Options,
+    x_is_sorted: Optional[List[bool]] = None,
+    pyramids: Optional[List[Optional[MinMaxPyramid]]] = None,
+    pixels: Optional[NDArray] = None,
+) -> Surface:
     """
     Assemble the graph surface for a scatter plot.
-    """
 
-    # Gridlines
-    horizontal_gridline_layers = [
-        layer_factory.render_horizontal_gridline(y=y, options=options, index=i)
-        for i, y in enumerate(options.y_gridlines)
-    ]
-    vertical_gridline_layers = [
-        layer_factory.render_vertical_gridline(x=x, options=options, index=i)
-        for i, x in enumerate(options.x_gridlines)
-    ]
+    All elements are drawn into a single surface, each writing only the cells
+    it covers. If `pixels` of earlier points are given, the points are added
+    to these.
+    """
+    surface = layer_factory.blank_surface(options)
+    _render_gridlines(options, surface)
 
     # Pixels
-    pixel_layer = layer_factory.render_points(xs=xs, ys=ys, options=options)
+    layer_factory.render_points(
+        xs=xs,
+        ys=ys,
+        options=options,
+        x_is_sorted=x_is_sorted,
+        pyramids=pyramids,
+        surface=surface,
+        priority=POINTS_PRIORITY,
+        pixels=pixels,
+    )
+
+    return surface
+
 
-    # Assemble graph surface
-    all_layers = horizontal_gridline_layers + vertical_gridline_layers + [pixel_layer]
-    return _merge_layers(all_layers, options=options)
+def assemble_heatmap(counts: NDArray, options: Options) -> Surface:
+    """
+    Assemble the graph surface for a heatmap with one count per character
+    cell.
+    """
+    surface = layer_factory.blank_surface(options)
+    _render_gridlines(options, surface)
+    layer_factory.render_counts(
+        counts, options=options, surface=surface, priority=POINTS_PRIORITY
+    )
+    return surface
 
 
 ###########
@@ -35,18 +63,16 @@ def assemble_scatter_plot(
 ###########
 
 
-def _merge_layers(character_layers: List[NDArray], options: Options) -> NDArray:
-    merged_layer = layer_factory.blank_character_matrix(
-        width=options.width, height=options.height
+def _render_gridlines(options: Options, surface: Surface) -> None:
+    layer_factory.render_horizontal_gridlines(
+        ys=options.y_gridlines,
+        options=options,
+        surface=surface,
+        priority=Y_GRIDLINE_PRIORITY,
+    )
+    layer_factory.render_vertical_gridlines(
+        xs=options.x_gridlines,
+        options=options,
+        surface=surface,
+        priority=X_GRIDLINE_PRIORITY,
     )
-
-    # Merge layers on top
-    for character_layer in character_layers:
-        # Just checking
-        assert character_layer.shape == (options.height, options.width), (
-            f"{character_layer.shape} != {(options.height, options.width)}"
-        )
-        to_replace_mask = character_layer != ""
-        merged_layer[to_replace_mask] = character_layer[to_replace_mask]
-
-    return merged_layer
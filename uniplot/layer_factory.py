@@ -1,98 +1,287 @@
 import numpy as np
 from numpy.typing import NDArray
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Sequence, Final, Literal
 
 import uniplot.pixel_matrix as pixel_matrix
 import uniplot.character_sets as character_sets
 from uniplot.conversions import convert_matrix_to_rows_of_submatrices
 from uniplot.options import Options, CharacterSet
-from uniplot.discretizer import discretize
-from uniplot.colors import COLOR_RESET_CODE
+from uniplot.discretizer import discretize_array
+from uniplot.colors import Color
+from uniplot.min_max_pyramid import MinMaxPyramid
+from uniplot.surface import Surface, GRIDLINE_CHARACTERS
 
+# Relative tolerance to treat a scrolled view as shifted by whole pixel columns
+SCROLL_TOLERANCE: Final = 1e-9
 
-Y_GRIDLINE_CHARACTERS = ["▔", "─", "▁"]
 
-
-def blank_character_matrix(width: int, height: int) -> NDArray:
+def blank_surface(options: Options) -> Surface:
     """
-    Initialize an empty character matrix as a NumPy array.
+    Initialize an empty graph surface, with the lookup tables of all glyphs and
+    colors that might be used with the given options.
     """
-    return _init_character_matrix(width, height, value=" ")
+    _, _, _, char_list = _set_up_submatrix_shape_and_encoders(options)
+    return Surface.blank(
+        width=options.width,
+        height=options.height,
+        glyphs=list(char_list[1:])
+        + GRIDLINE_CHARACTERS
+        + (_density_characters(options) if options.density else []),
+        colors=(options.color or [])
+        + (options.y_gridlines_color or [])
+        + (options.x_gridlines_color or []),
+    )
 
 
-def render_horizontal_gridline(y: float, options: Options, index: int = 0) -> NDArray:
+def render_horizontal_gridlines(
+    ys: Sequence[float],
+    options: Options,
+    surface: Optional[Surface] = None,
+    priority: int = 0,
+) -> Surface:
     """
-    Render the pixel matrix that only consists of a line where the `y` value is.
+    Render lines where the `ys` values are into the surface, or into a new
+    blank surface if none is given. All lines are drawn at once, and the color
+    of each line is picked from the `y_gridlines_color` option in turn.
 
     Because a character is higher than wide, this is rendered with "super-resolution"
     Unicode characters.
     """
-    pixels = _init_character_matrix(width=options.width, height=options.height)
-    if y < options.y_min or y >= options.y_max:
-        return pixels
+    if surface is None:
+        surface = blank_surface(options)
+    positions = np.asarray(ys, dtype=float)
+    visible = np.flatnonzero((positions >= options.y_min) & (positions < options.y_max))
 
     if options.character_set == CharacterSet.ASCII:
-        y_index = (
+        y_indices = (
             options.height
             - 1
-            - discretize(
-                x=y, x_min=options.y_min, x_max=options.y_max, steps=options.height
+            - discretize_array(
+                positions[visible],
+                x_min=options.y_min,
+                x_max=options.y_max,
+                steps=options.height,
             )
         )
-        character = "─"
-        if options.y_gridlines_color and len(options.y_gridlines_color) > 0:
-            color = options.y_gridlines_color[index % len(options.y_gridlines_color)]
-            character = color.colorize(character)
-        pixels[y_index, :] = character
+        glyph_ids = np.full(len(visible), surface.glyph_id("─"))
     else:
-        y_index_superresolution = (
+        y_indices_superresolution = (
             3 * options.height
             - 1
-            - discretize(
-                x=y, x_min=options.y_min, x_max=options.y_max, steps=3 * options.height
+            - discretize_array(
+                positions[visible],
+                x_min=options.y_min,
+                x_max=options.y_max,
+                steps=3 * options.height,
             )
         )
-        y_index = int(y_index_superresolution / 3)
-        character = Y_GRIDLINE_CHARACTERS[y_index_superresolution % 3]
-        if options.y_gridlines_color and len(options.y_gridlines_color) > 0:
-            color = options.y_gridlines_color[index % len(options.y_gridlines_color)]
-            character = color.colorize(character)
-        pixels[y_index, :] = character
+        y_indices = y_indices_superresolution // 3
+        glyph_ids = np.array([surface.glyph_id(c) for c in GRIDLINE_CHARACTERS[:3]])[
+            y_indices_superresolution % 3
+        ]
+    color_ids = _gridline_color_ids(surface, options.y_gridlines_color, visible)
+
+    # Of several lines in the same row, only the last one is visible
+    y_indices, last = _last_occurrences(y_indices)
+    surface.draw(
+        rows=y_indices[:, None],
+        columns=np.arange(options.width)[None, :],
+        glyph_ids=glyph_ids[last, None],
+        color_ids=color_ids[last, None],
+        priority=priority,
+    )
+    return surface
 
-    return pixels
+
+def render_vertical_gridlines(
+    xs: Sequence[float],
+    options: Options,
+    surface: Optional[Surface] = None,
+    priority: int = 0,
+) -> Surface:
+    """
+    Render lines where the `xs` values are into the surface, or into a new
+    blank surface if none is given. All lines are drawn at once, and the color
+    of each line is picked from the `x_gridlines_color` option in turn.
+    """
+    if surface is None:
+        surface = blank_surface(options)
+    positions = np.asarray(xs, dtype=float)
+    visible = np.flatnonzero((positions >= options.x_min) & (positions < options.x_max))
+
+    x_indices = discretize_array(
+        positions[visible],
+        x_min=options.x_min,
+        x_max=options.x_max,
+        steps=options.width,
+    )
+    color_ids = _gridline_color_ids(surface, options.x_gridlines_color, visible)
+
+    # Of several lines in the same column, only the last one is visible
+    x_indices, last = _last_occurrences(x_indices)
+    surface.draw(
+        rows=np.arange(options.height)[:, None],
+        columns=x_indices[None, :],
+        glyph_ids=surface.glyph_id("│"),
+        color_ids=color_ids[None, last],
+        priority=priority,
+    )
+    return surface
 
 
-def render_vertical_gridline(x: float, options: Options, index: int = 0) -> NDArray:
+def render_points(
+    xs: List[NDArray],
+    ys: List[NDArray],
+    options: Options,
+    x_is_sorted: Optional[List[bool]] = None,
+    pyramids: Optional[List[Optional[MinMaxPyramid]]] = None,
+    surface: Optional[Surface] = None,
+    priority: int = 0,
+    pixels: Optional[NDArray] = None,
+) -> Surface:
     """
-    Render the pixel matrix that only consists of a line where the `x` value is.
+    Render the points of all series into the surface, or into a new blank
+    surface if none is given. Only the cells with points are drawn.
+
+    If `pixels` of earlier points are given, the points are added to them in
+    place. The pixels of all points are kept in the `pixels` of the surface.
+
+    If `x_is_sorted` is supplied, sorted series are cut down to the points in
+    view before rendering. If a series has a pyramid, its line is rendered
+    from the few points the pyramid selects for the view.
+
+    With the `density` option, the points are counted instead, see
+    `render_point_density`.
     """
-    pixels = _init_character_matrix(width=options.width, height=options.height)
-    if float(x) < float(options.x_min) or float(x) >= float(options.x_max):
-        return pixels
+    if options.density:
+        return render_point_density(
+            xs, ys, options, x_is_sorted=x_is_sorted, surface=surface, priority=priority
+        )
+
+    # Setup: determine submatrix size and encoder
+    scale_w, scale_h, encoder, _ = _set_up_submatrix_shape_and_encoders(options)
+    full_width = scale_w * options.width
+    full_height = scale_h * options.height
+
+    # Cut sorted series down to the points in view
+    visible_xs, visible_ys = [], []
+    for series_index, (x, y, lines) in enumerate(zip(xs, ys, options.lines)):
+        series_is_sorted = x_is_sorted[series_index] if x_is_sorted else None
+        if series_is_sorted:
+            visible = _visible_slice(
+                x, x_min=options.x_min, x_max=options.x_max, width=full_width
+            )
+            pyramid = pyramids[series_index] if pyramids else None
+            if lines and pyramid is not None:
+                selected = pyramid.visible_indices(
+                    start=visible.start,
+                    end=visible.stop,
+                    x_min=options.x_min,
+                    x_max=options.x_max,
+                    width=full_width,
+                )
+                x, y = x[selected], y[selected]
+            else:
+                x, y = x[visible], y[visible]
+        visible_xs.append(x)
+        visible_ys.append(y)
+
+    # Render all series into a full pixel matrix at once, where each series
+    # is drawn with its index plus one as layer
+    px_matrix = pixel_matrix.render_layers(
+        xs=visible_xs,
+        ys=visible_ys,
+        x_min=options.x_min,
+        x_max=options.x_max,
+        y_min=options.y_min,
+        y_max=options.y_max,
+        width=full_width,
+        height=full_height,
+        lines=options.lines,
+        x_is_sorted=x_is_sorted,
+    )
 
-    x_index = discretize(
-        x=x, x_min=options.x_min, x_max=options.x_max, steps=options.width
+    if pixels is not None:
+        assert pixels.shape == px_matrix.shape, f"{pixels.shape} != {px_matrix.shape}"
+        # Series that are rendered later are on top, and these have the
+        # higher layer values
+        px_matrix = np.maximum(pixels, px_matrix, out=pixels)
+
+    # Break down pixel matrix into submatrices per character cell
+    submatrices = convert_matrix_to_rows_of_submatrices(
+        px_matrix,
+        width_submatrix=scale_w,
+        height_submatrix=scale_h,
     )
 
-    character = "│"
-    if options.x_gridlines_color and len(options.x_gridlines_color) > 0:
-        color = options.x_gridlines_color[index % len(options.x_gridlines_color)]
-        character = color.colorize(character)
-    pixels[:, x_index] = character
+    color_matrix = submatrices.max(axis=2) - 1  # For optional color use
 
-    return pixels
+    if options.character_set != CharacterSet.ASCII:
+        max_vals = submatrices.max(axis=2, keepdims=True)
+        submatrices = ((submatrices == max_vals) & (max_vals > 0)).astype(int)
+    else:
+        # The layer selects the marker, where the markers repeat for more
+        # series, like in the legend
+        nr_markers = len(options.force_ascii_characters)
+        submatrices = np.where(submatrices > 0, (submatrices - 1) % nr_markers + 1, 0)
 
+    # Encode submatrices into integer values representing character shapes,
+    # which are also the glyph IDs of the surface
+    glyph_matrix = (submatrices * encoder).sum(axis=2)
+    rows, columns = np.nonzero(glyph_matrix)
 
-def render_points(xs: List[NDArray], ys: List[NDArray], options: Options) -> NDArray:
-    # Setup: determine submatrix size, encoder, and character list
-    scale_w, scale_h, encoder, char_list = _set_up_submatrix_shape_and_encoders(options)
+    if surface is None:
+        surface = blank_surface(options)
+
+    # Apply color if enabled
+    color_ids: NDArray = np.zeros(len(rows), dtype=int)
+    if options.color:
+        series_color_ids = np.array([surface.color_id(c) for c in options.color])
+        color_ids = series_color_ids[
+            color_matrix[rows, columns] % len(series_color_ids)
+        ]
+
+    surface.draw(
+        rows=rows,
+        columns=columns,
+        glyph_ids=glyph_matrix[rows, columns],
+        color_ids=color_ids,
+        priority=priority,
+    )
+    surface.pixels = px_matrix
+    return surface
+
+
+def render_point_density(
+    xs: List[NDArray],
+    ys: List[NDArray],
+    options: Options,
+    x_is_sorted: Optional[List[bool]] = None,
+    surface: Optional[Surface] = None,
+    priority: int = 0,
+) -> Surface:
+    """
+    Render the number of points of all series in each character cell as a
+    shade, into the surface or into a new blank surface if none is given. This
+    keeps the structure of dense clouds of points visible, where drawing every
+    point would just fill the area.
+
+    If colors are enabled, each cell gets the color of the last series with
+    points in it. Lines are not drawn.
+    """
+    scale_w, scale_h, _, _ = _set_up_submatrix_shape_and_encoders(options)
     full_width = scale_w * options.width
     full_height = scale_h * options.height
 
-    # Render input points into a full pixel matrix
-    px_matrix = np.zeros((full_height, full_width), dtype=np.int32)
-    for series_index, (x, y, lines) in enumerate(zip(xs, ys, options.lines)):
-        px_matrix = pixel_matrix.render(
+    counts = np.zeros((options.height, options.width), dtype=np.int64)
+    layers = np.zeros((options.height, options.width), dtype=int)
+    for series_index, (x, y) in enumerate(zip(xs, ys)):
+        if x_is_sorted and x_is_sorted[series_index]:
+            visible = _visible_slice(
+                x, x_min=options.x_min, x_max=options.x_max, width=full_width
+            )
+            x, y = x[visible], y[visible]
+        pixel_counts = pixel_matrix.count_points(
             xs=x,
             ys=y,
             x_min=options.x_min,
@@ -101,54 +290,215 @@ def render_points(xs: List[NDArray], ys: List[NDArray], options: Options) -> NDA
             y_max=options.y_max,
             width=full_width,
             height=full_height,
-            lines=lines,
-            pixels=px_matrix,
-            layer=series_index + 1,
-        )  # type: ignore
+        )
+        # Sum up the pixels of each character cell
+        series_counts = pixel_counts.reshape(
+            options.height, scale_h, options.width, scale_w
+        ).sum(axis=(1, 3))
+        counts += series_counts
+        layers[series_counts > 0] = series_index
+
+    return render_counts(
+        counts, options, layers=layers, surface=surface, priority=priority
+    )
 
-    # Initialize output character matrix
-    char_matrix = _init_character_matrix(width=options.width, height=options.height)
 
-    # Break down pixel matrix into submatrices per character cell
+def render_counts(
+    counts: NDArray,
+    options: Options,
+    layers: Optional[NDArray] = None,
+    surface: Optional[Surface] = None,
+    priority: int = 0,
+) -> Surface:
+    """
+    Render a count per character cell as a shade, into the surface or into a
+    new blank surface if none is given. The shades are scaled logarithmically
+    up to the highest count.
+
+    If colors are enabled, each cell gets the color of the series given in
+    `layers`, or of the first series if there are no layers.
+    """
+    if surface is None:
+        surface = blank_surface(options)
+    assert counts.shape == (options.height, options.width), counts.shape
+    rows, columns = np.nonzero(counts)
+    if len(rows) == 0:
+        return surface
+
+    density_glyph_ids = np.array(
+        [surface.glyph_id(c) for c in _density_characters(options)]
+    )
+    levels = np.ceil(
+        len(density_glyph_ids)
+        * np.log1p(counts[rows, columns])
+        / np.log1p(counts.max())
+    ).astype(int)
+
+    color_ids: NDArray = np.zeros(len(rows), dtype=int)
+    if options.color:
+        series_color_ids = np.array([surface.color_id(c) for c in options.color])
+        cell_layers = 0 if layers is None else layers[rows, columns]
+        color_ids = series_color_ids[cell_layers % len(series_color_ids)]
+
+    surface.draw(
+        rows=rows,
+        columns=columns,
+        glyph_ids=density_glyph_ids[levels - 1],
+        color_ids=color_ids,
+        priority=priority,
+    )
+    return surface
+
+
+def render_sparklines(series: List[NDArray], options: Options) -> NDArray:
+    """
+    Render each of the `series` as a sparkline of `options.width` characters
+    and `options.height` lines, without axes or labels. Each series is scaled
+    to its own range.
+
+    Returns the matrix of characters, with the lines of all sparklines below
+    each other.
+    """
+    scale_w, scale_h, encoder, char_list = _set_up_submatrix_shape_and_encoders(options)
+    width, height = scale_w * options.width, scale_h * options.height
+    lows, highs = pixel_matrix.sparkline_spans(series, width=width, height=height)
+
+    # Pixel rows counted from the bottom, from the top row down
+    pixel_rows = np.arange(height - 1, -1, -1)[None, :, None]
+    pixels = (pixel_rows >= lows[:, None, :]) & (pixel_rows <= highs[:, None, :])
     submatrices = convert_matrix_to_rows_of_submatrices(
-        px_matrix,
+        pixels.reshape(len(series) * height, width).astype(int),
         width_submatrix=scale_w,
         height_submatrix=scale_h,
     )
+    glyph_matrix = (submatrices * encoder).sum(axis=2)
+    return np.array([" ", *char_list[1:]])[glyph_matrix]
 
-    color_matrix = submatrices.max(axis=2) - 1  # For optional color use
 
-    if options.character_set != CharacterSet.ASCII:
-        max_vals = submatrices.max(axis=2, keepdims=True)
-        submatrices = ((submatrices == max_vals) & (max_vals > 0)).astype(int)
+def scrolled_columns(previous: Options, options: Options) -> Optional[int]:
+    """
+    Returns by how many pixel columns the view of the `options` is scrolled to
+    the right of the `previous` view, if the pixels of the points only differ
+    by that shift. Otherwise, returns `None`.
+
+    Pixel coordinates are rounded half to even, so points exactly between two
+    pixels would end up in a different column after an odd shift. Only even
+    shifts are therefore returned.
+    """
+    if (
+        previous.character_set != options.character_set
+        or previous.width != options.width
+        or previous.height != options.height
+        or previous.lines != options.lines
+        or previous.y_min != options.y_min
+        or previous.y_max != options.y_max
+    ):
+        return None
+
+    x_range = options.x_max - options.x_min
+    if abs((previous.x_max - previous.x_min) - x_range) > SCROLL_TOLERANCE * x_range:
+        return None
+    scale_w, _, _, _ = _set_up_submatrix_shape_and_encoders(options)
+    full_width = scale_w * options.width
+    columns = (full_width - 1) * (options.x_min - previous.x_min) / x_range
+    nr_columns = round(columns)
+    if (
+        abs(columns - nr_columns) > SCROLL_TOLERANCE
+        or nr_columns % 2 != 0
+        or not 0 <= nr_columns < full_width
+    ):
+        return None
+    return nr_columns
+
+
+def scrolling_x_bounds(
+    capacity: int, last_index: int, options: Options
+) -> Tuple[float, float]:
+    """
+    Returns the x bounds of a view of the last `capacity` points of a serial
+    index that ends at `last_index`. The view follows the last point such that
+    it only ever moves by an even number of pixel columns, so consecutive
+    frames can be scrolled, see `scrolled_columns`.
+
+    Either every point is a power of two of pixel columns wide, or every
+    pixel column is a whole number of points wide. So the bounds, and the
+    pixel coordinates of the points, are exact.
+    """
+    scale_w, _, _, _ = _set_up_submatrix_shape_and_encoders(options)
+    nr_column_steps = scale_w * options.width - 1
+    nr_point_steps = max(capacity - 1, 1)
+    if nr_column_steps >= 2 * nr_point_steps:
+        # The largest power of two that fits
+        columns_per_point = 1 << ((nr_column_steps // nr_point_steps).bit_length() - 1)
+        x_range = nr_column_steps / columns_per_point
+        step = 1
+    elif nr_column_steps > 2:
+        # The view moves by two columns at a time, so it ends up to that many
+        # points after the last one, and still needs to show the first one
+        points_per_column = -(-(nr_point_steps - 1) // (nr_column_steps - 2))
+        x_range = points_per_column * nr_column_steps
+        step = 2 * points_per_column
+    else:
+        return (last_index - nr_point_steps, last_index)
+    x_max = -(-last_index // step) * step
+    return (x_max - x_range, x_max)
 
-    # Encode submatrices into integer values representing character shapes
-    int_matrix = (submatrices * encoder).sum(axis=2)
-    mask_nonzero = int_matrix != 0
 
-    # Character decoding and assignment
-    decoder = np.array(char_list)
-    decoder[..., 0] = ""  # Blank character for zero entries
-    char_matrix[mask_nonzero] = decoder[int_matrix[mask_nonzero]]
+def scroll_pixels(
+    pixels: NDArray,
+    xs: List[NDArray],
+    ys: List[NDArray],
+    options: Options,
+    nr_columns: int,
+) -> List[int]:
+    """
+    Shift the `pixels` of earlier points left by `nr_columns` in place, where
+    the new columns on the right are left empty. The number of columns must be
+    even, as returned by `scrolled_columns`, since only then do points exactly
+    between two pixels keep their column.
 
-    # Apply color if enabled
-    if options.color:
-        color_enable_strings = [c.enable_str() for c in options.color]
+    The `xs` and `ys` are the current points, with sorted x values. Points
+    that have been dropped from the start of the series since are removed,
+    by rendering the left edge of the series again.
 
-        decoder_colored = np.array(
-            [
-                np.char.add(np.char.add(c, char_list), COLOR_RESET_CODE)
-                for c in color_enable_strings
-            ]
+    Returns the index of the first point of each series that needs to be
+    rendered to fill the new columns on the right.
+    """
+    full_width = pixels.shape[1]
+    x_step = (options.x_max - options.x_min) / (full_width - 1)
+    if nr_columns > 0:
+        pixels[:, :-nr_columns] = pixels[:, nr_columns:]
+        pixels[:, -nr_columns:] = 0
+
+    # Lines to dropped points end at the first point of the series, so they
+    # can be visible up to its pixel column, plus one column for rounding
+    first_columns = [
+        float(
+            pixel_matrix.pixel_columns(x[0], options.x_min, options.x_max, full_width)
         )
-        indices = (
-            color_matrix[mask_nonzero] % len(color_enable_strings),
-            int_matrix[mask_nonzero],
+        for x in xs
+        if len(x) > 0 and not np.isnan(x[0])
+    ]
+    edge = min(int(max(first_columns, default=-1)) + 2, full_width)
+    if edge > 0:
+        pixels[:, :edge] = 0
+        # Render all points up to the first one right of the edge again
+        x_edge = options.x_min + (edge + 1) * x_step
+        ends = [int(np.searchsorted(x, x_edge, side="right")) + 1 for x in xs]
+        render_points(
+            xs=[x[:end] for x, end in zip(xs, ends)],
+            ys=[y[:end] for y, end in zip(ys, ends)],
+            options=options,
+            x_is_sorted=[True] * len(xs),
+            pixels=pixels,
         )
-        decoder_colored[..., 0] = ""
-        char_matrix[mask_nonzero] = decoder_colored[indices]
 
-    return char_matrix
+    if nr_columns == 0:
+        return [len(x) for x in xs]
+    # Start one column early, and with the last point left of that, for lines
+    # that enter the new columns
+    x_right = options.x_min + (full_width - nr_columns - 1) * x_step
+    return [max(int(np.searchsorted(x, x_right, side="left")) - 1, 0) for x in xs]
 
 
 def print_raw_pixel_matrix(pixels: NDArray, verbose: bool = False) -> None:
@@ -167,8 +517,65 @@ def print_raw_pixel_matrix(pixels: NDArray, verbose: bool = False) -> None:
 ###########
 
 
-def _init_character_matrix(width: int, height: int, value: str = "") -> NDArray:
-    return np.full((height, width), fill_value=value, dtype="<U25")
+def _visible_slice(xs: NDArray, x_min: float, x_max: float, width: int) -> slice:
+    """
+    Returns the index range of the points of a sorted series that are in view,
+    including the neighbors on both sides to keep lines continuous.
+
+    Points up to half a pixel outside of the range from `x_min` to `x_max`
+    are still drawn at the edge, so we add a margin of one pixel.
+    """
+    if width < 2:
+        return slice(0, len(xs))
+    margin = (x_max - x_min) / (width - 1)
+    start = _search_sorted(xs, x_min - margin, side="left") - 1
+    end = _search_sorted(xs, x_max + margin, side="right") + 1
+    return slice(max(start, 0), min(end, len(xs)))
+
+
+def _search_sorted(xs: NDArray, value: float, side: Literal["left", "right"]) -> int:
+    """
+    Like `numpy.searchsorted` for a single value. Integer `xs` are searched
+    for an integer, as NumPy would otherwise convert all of them into floats.
+    """
+    dtype = getattr(xs, "dtype", None)
+    if dtype is None or not np.issubdtype(dtype, np.integer) or np.isnan(value):
+        return int(np.searchsorted(xs, value, side=side))
+
+    limits = np.iinfo(dtype)
+    rounded = np.ceil(value) if side == "left" else np.floor(value)
+    if rounded < limits.min:
+        return 0
+    if rounded > limits.max:
+        return len(xs)
+    return int(np.searchsorted(xs, dtype.type(rounded), side=side))
+
+
+def _density_characters(options: Options) -> List[str]:
+    if options.character_set == CharacterSet.ASCII:
+        return character_sets.ASCII_DENSITY_CHARACTER_SET
+    return character_sets.DENSITY_CHARACTER_SET
+
+
+def _gridline_color_ids(
+    surface: Surface, colors: Optional[List[Color]], line_indices: NDArray
+) -> NDArray:
+    """
+    Returns the color ID of each gridline, cycling through the `colors`.
+    """
+    if not colors:
+        return np.zeros(len(line_indices), dtype=int)
+    color_ids = np.array([surface.color_id(c) for c in colors])
+    return color_ids[line_indices % len(color_ids)]
+
+
+def _last_occurrences(indices: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    Returns the unique values of `indices`, and the position of the last
+    occurrence of each.
+    """
+    unique, reversed_positions = np.unique(indices[::-1], return_index=True)
+    return (unique, len(indices) - 1 - reversed_positions)
 
 
 def _set_up_submatrix_shape_and_encoders(
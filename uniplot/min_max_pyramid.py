@@ -0,0 +1,130 @@
+"""
+A level-of-detail structure to quickly render line plots of long series at any
+zoom level.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+from typing import List, Final, Optional
+
+from uniplot.pixel_matrix import pixel_columns
+
+BRANCHING_FACTOR: Final = 8
+
+
+class MinMaxPyramid:
+    """
+    A pyramid of the minima and maxima of a series with sorted x values and
+    without NaN values.
+
+    Level `k` splits the series into buckets of `BRANCHING_FACTOR ** k`
+    consecutive points, and stores the index of the minimum and maximum of
+    each bucket. Level `0` are the points themselves and is not stored.
+    """
+
+    def __init__(self, xs: NDArray, ys: NDArray) -> None:
+        self.xs: NDArray = xs
+        self.ys: NDArray = ys
+        self.argmins: List[NDArray] = []
+        self.argmaxs: List[NDArray] = []
+
+        argmins: Optional[NDArray] = None
+        argmaxs: Optional[NDArray] = None
+        while argmins is None or len(argmins) > 1:
+            argmins = _reduce_level(ys, argmins, pick_max=False)
+            argmaxs = _reduce_level(ys, argmaxs, pick_max=True)
+            self.argmins.append(argmins)
+            self.argmaxs.append(argmaxs)
+
+    def visible_indices(
+        self, start: int, end: int, x_min: float, x_max: float, width: int
+    ) -> NDArray:
+        """
+        Returns the sorted indices of the points between `start` and `end`
+        that are needed to render the line plot of the view.
+
+        Rendering a line through these points gives exactly the same pixels as
+        rendering all points between `start` and `end`: For every bucket that
+        lies within a single pixel column, we only need its first, last,
+        minimum and maximum point. Buckets that span several pixel columns, or
+        that are only partially in the index range, are refined into the
+        buckets of the next lower level. Since only few buckets contain a
+        column boundary, the cost mostly depends on the `width`, and not on the
+        number of points.
+        """
+        if end <= start:
+            return np.array([], dtype=int)
+
+        # Start with the coarsest level that still has more buckets in view
+        # than there are pixel columns
+        level = 0
+        while (
+            level < len(self.argmins)
+            and BRANCHING_FACTOR ** (level + 1) * width <= end - start
+        ):
+            level += 1
+        size = BRANCHING_FACTOR**level
+        buckets = np.arange(start // size, (end - 1) // size + 1)
+
+        selected: List[NDArray] = []
+        while level > 0:
+            firsts = buckets * size
+            lasts = np.minimum(firsts + size, len(self.ys)) - 1
+            in_single_column = pixel_columns(
+                self.xs[firsts], x_min=x_min, x_max=x_max, width=width
+            ) == pixel_columns(self.xs[lasts], x_min=x_min, x_max=x_max, width=width)
+            complete = (firsts >= start) & (lasts < end) & in_single_column
+
+            done = buckets[complete]
+            selected += [
+                firsts[complete],
+                lasts[complete],
+                self.argmins[level - 1][done],
+                self.argmaxs[level - 1][done],
+            ]
+
+            # Refine all other buckets
+            level -= 1
+            size //= BRANCHING_FACTOR
+            buckets = (
+                buckets[~complete][:, None] * BRANCHING_FACTOR
+                + np.arange(BRANCHING_FACTOR)
+            ).ravel()
+            buckets = buckets[(buckets * size < end) & ((buckets + 1) * size > start)]
+
+        selected.append(buckets)
+        return np.unique(np.concatenate(selected))
+
+
+###########
+# private #
+###########
+
+
+def _reduce_level(ys: NDArray, children: Optional[NDArray], pick_max: bool) -> NDArray:
+    """
+    Returns the index of the minimum or maximum of each bucket of the next
+    level, given the index of the extremum of each bucket of the current
+    level. If `children` is `None`, the current level are the points.
+    """
+    # Pad with a value that is never picked, in the type of the values
+    fill: float
+    if np.issubdtype(ys.dtype, np.integer):
+        limits = np.iinfo(ys.dtype)
+        fill = limits.min if pick_max else limits.max
+    else:
+        fill = -np.inf if pick_max else np.inf
+    if children is None:
+        padding = (-len(ys)) % BRANCHING_FACTOR
+        values = np.concatenate((ys, np.full(padding, fill, dtype=ys.dtype)))
+        values = values.reshape(-1, BRANCHING_FACTOR)
+        choice = values.argmax(axis=1) if pick_max else values.argmin(axis=1)
+        return np.arange(len(values)) * BRANCHING_FACTOR + choice
+
+    padding = (-len(children)) % BRANCHING_FACTOR
+    values = np.concatenate((ys[children], np.full(padding, fill, dtype=ys.dtype)))
+    values = values.reshape(-1, BRANCHING_FACTOR)
+    children = np.concatenate((children, np.full(padding, children[-1])))
+    children = children.reshape(-1, BRANCHING_FACTOR)
+    choice = values.argmax(axis=1) if pick_max else values.argmin(axis=1)
+    return children[np.arange(len(children)), choice]
@@ -1,7 +1,17 @@
+import math
 import numpy as np
+from itertools import islice
 from numpy.typing import NDArray
 
-from typing import List, Any
+from typing import List, Any, Optional, Final, Tuple
+
+from uniplot.pixel_matrix import is_sorted
+from uniplot.min_max_pyramid import MinMaxPyramid
+from uniplot.ring_buffer import RingBuffer
+from uniplot.serial_index import SerialIndex
+
+TIME_SERIES_SAMPLE_SIZE: Final = 8
+BOUNDS_CHUNK_SIZE: Final = 2**16
 
 
 class MultiSeries:
@@ -24,40 +34,34 @@ class MultiSeries:
         self.x_is_time_series: bool = False
         self.y_is_time_series: bool = False
 
-        # Initialize y series
-        if self.is_multi_dimensional:
-            self.y_is_time_series = all([_is_time_series(y) for y in ys])
-            if self.y_is_time_series:
-                self.ys = [_cast_as_numpy_time_series(ys_row) for ys_row in ys]
-            else:
-                self.ys = [_cast_as_numpy_floats(ys_row) for ys_row in ys]
-        else:
-            self.y_is_time_series = _is_time_series(ys)
+        # Whether log10 was already applied, see `set_x_axis_to_log10`
+        self.x_is_log10: bool = False
+        self.y_is_log10: bool = False
 
-            if self.y_is_time_series:
-                self.ys = [_cast_as_numpy_time_series(ys)]
-            else:
-                self.ys = [_cast_as_numpy_floats(ys)]
+        # Initialize y series, where each series is converted into a NumPy
+        # array only once, without copying if it already is one
+        y_arrays = [_as_numpy_array(y) for y in _rows(ys, self.is_multi_dimensional)]
+        self.y_is_time_series = all([_is_time_series(y) for y in y_arrays])
+        self.ys = [_cast_as_numpy(y, self.y_is_time_series) for y in y_arrays]
 
         # Initialize x series
         if xs is None:
-            # Initialize as a serial index
-            self.xs = [np.arange(1, len(y) + 1, step=1, dtype=int) for y in self.ys]
+            # Initialize as a serial index, which continues for ring buffers.
+            # Its values are only computed where they are needed, but
+            # otherwise it can be used like an array.
+            serial_indices: List[Any] = [
+                y.index()
+                if isinstance(y, RingBuffer)
+                else SerialIndex(start=1, length=len(y))
+                for y in _rows(ys, self.is_multi_dimensional)
+            ]
+            self.xs = serial_indices
         else:
-            if self.is_multi_dimensional:
-                self.x_is_time_series = all([_is_time_series(x) for x in xs])
-
-                if self.x_is_time_series:
-                    self.xs = [_cast_as_numpy_time_series(xs_row) for xs_row in xs]
-                else:
-                    self.xs = [_cast_as_numpy_floats(xs_row) for xs_row in xs]
-            else:
-                self.x_is_time_series = _is_time_series(xs)
-
-                if self.x_is_time_series:
-                    self.xs = [_cast_as_numpy_time_series(xs)]
-                else:
-                    self.xs = [_cast_as_numpy_floats(xs)]
+            x_arrays = [
+                _as_numpy_array(x) for x in _rows(xs, self.is_multi_dimensional)
+            ]
+            self.x_is_time_series = all([_is_time_series(x) for x in x_arrays])
+            self.xs = [_cast_as_numpy(x, self.x_is_time_series) for x in x_arrays]
 
         # In the end, the dimensions of xs and ys need to match
         assert len(self.xs) == len(self.ys)
@@ -65,6 +69,20 @@ class MultiSeries:
             len(ys_row) for ys_row in self.ys
         ]
 
+        # Remember which x series are sorted, such that we can quickly find the
+        # points in view later on. A serial index is always sorted.
+        self.x_is_sorted: List[bool] = (
+            [True] * len(self.xs) if xs is None else [is_sorted(x) for x in self.xs]
+        )
+
+        # Optional level-of-detail pyramids, see `build_pyramids`
+        self.pyramids: List[Optional[MinMaxPyramid]] = [None] * len(self.ys)
+
+        # The minimum and maximum of all x and y values, computed on demand.
+        # They need to be reset whenever the series change.
+        self._x_bounds: Optional[Tuple[float, float]] = None
+        self._y_bounds: Optional[Tuple[float, float]] = None
+
     def __len__(self) -> int:
         """
         Return the number of time series.
@@ -80,39 +98,110 @@ class MultiSeries:
         """
         return [len(ys_row) for ys_row in self.ys]
 
+    def append(self, other: "MultiSeries") -> None:
+        """
+        Append the points of another `MultiSeries` with the same number of
+        series to each series. Log10 is applied to the new points if it was
+        applied to these series.
+
+        Bounds that were already computed are updated from the bounds of the
+        new points.
+        """
+        if len(other) != len(self):
+            raise ValueError("Cannot append a different number of series.")
+        if (
+            other.x_is_time_series != self.x_is_time_series
+            or other.y_is_time_series != self.y_is_time_series
+        ):
+            raise ValueError("Cannot append points of a different type.")
+        if self.x_is_log10:
+            other.set_x_axis_to_log10()
+        if self.y_is_log10:
+            other.set_y_axis_to_log10()
+
+        self.x_is_sorted = [
+            x_is_sorted and is_sorted(np.concatenate((x[-1:], other_x)))
+            for x_is_sorted, x, other_x in zip(self.x_is_sorted, self.xs, other.xs)
+        ]
+        self.xs = [_concatenate(x, other_x) for x, other_x in zip(self.xs, other.xs)]
+        self.ys = [
+            np.concatenate((y, other_y)) for y, other_y in zip(self.ys, other.ys)
+        ]
+        self.pyramids = [None] * len(self.ys)
+        if self._x_bounds is not None:
+            self._x_bounds = _merged_bounds(self._x_bounds, other._bounds_of_xs())
+        if self._y_bounds is not None:
+            self._y_bounds = _merged_bounds(self._y_bounds, other._bounds_of_ys())
+
     def set_x_axis_to_log10(self) -> None:
         """
-        Apply log10 to all x series.
+        Apply log10 to all x series, unless it was already applied.
 
         Raises a `ValueError` if any the x-axis is a time series.
         """
         if self.x_is_time_series:
             raise ValueError("Cannot format a time series as logarithmic.")
+        if self.x_is_log10:
+            return
 
+        self.x_is_log10 = True
         self.xs = [_safe_log10(x) for x in self.xs]
+        self.x_is_sorted = [is_sorted(x) for x in self.xs]
+        self.pyramids = [None] * len(self.ys)
+        self._x_bounds = None
 
     def set_y_axis_to_log10(self) -> None:
         """
-        Apply log10 to all y series.
+        Apply log10 to all y series, unless it was already applied.
 
         Raises a `ValueError` if any the x-axis is a time series.
         """
         if self.y_is_time_series:
             raise ValueError("Cannot format a time series as logarithmic.")
+        if self.y_is_log10:
+            return
 
+        self.y_is_log10 = True
         self.ys = [_safe_log10(y) for y in self.ys]
+        self.pyramids = [None] * len(self.ys)
+        self._y_bounds = None
+
+    def build_pyramids(self) -> None:
+        """
+        Precompute a `MinMaxPyramid` for each series that has sorted x values
+        and no NaN values, such that line plots of any view can be rendered
+        without touching all points.
+        """
+        self.pyramids = [
+            MinMaxPyramid(xs=x, ys=y) if x_is_sorted and not np.isnan(y).any() else None
+            for x, y, x_is_sorted in zip(self.xs, self.ys, self.x_is_sorted)
+        ]
 
     def y_max(self) -> float:
-        return _safe_maxs(self.ys)
+        return _checked_bound(self._bounds_of_ys()[1])
 
     def y_min(self) -> float:
-        return _safe_mins(self.ys)
+        return _checked_bound(self._bounds_of_ys()[0])
 
     def x_max(self) -> float:
-        return _safe_maxs(self.xs)
+        return _checked_bound(self._bounds_of_xs()[1])
 
     def x_min(self) -> float:
-        return _safe_mins(self.xs)
+        return _checked_bound(self._bounds_of_xs()[0])
+
+    ###########
+    # private #
+    ###########
+
+    def _bounds_of_xs(self) -> Tuple[float, float]:
+        if self._x_bounds is None:
+            self._x_bounds = _nan_bounds(self.xs)
+        return self._x_bounds
+
+    def _bounds_of_ys(self) -> Tuple[float, float]:
+        if self._y_bounds is None:
+            self._y_bounds = _nan_bounds(self.ys)
+        return self._y_bounds
 
 
 ###########
@@ -134,41 +223,72 @@ def _is_multi_dimensional(series: Any) -> bool:
         return True
 
 
-def _is_time_series(series: Any) -> bool:
+def _rows(series: Any, is_multi_dimensional: bool) -> List[Any]:
+    return list(series) if is_multi_dimensional else [series]
+
+
+def _as_numpy_array(series: Any) -> NDArray:
+    """
+    Converts the series into a NumPy array. NumPy arrays are returned as they
+    are, and numeric pandas and polars series as well as ring buffers as views
+    of their data, so only other input like Python lists is copied.
+    """
+    return np.asarray(series)
+
+
+def _is_time_series(array: NDArray) -> bool:
     """
-    Check if the object is datetime-like. This might be a pandas DateTime, a
+    Check if the array is datetime-like. This might be a pandas DateTime, a
     list of datetimes, or a list of date(s).
+
+    Arrays of numbers are recognized from their dtype. For other arrays, only
+    the first few values are converted on a trial basis. Missing values, i.e.
+    `None` and NaN, convert to both numbers and datetimes, so they are skipped.
     """
-    np_array = np.array(series)
-    if np.issubdtype(np_array.dtype, np.number):
+    if np.issubdtype(array.dtype, np.datetime64):
+        return True
+    if array.dtype.kind not in "OSU":
         return False
+    sample = array[:TIME_SERIES_SAMPLE_SIZE]
+    if array.dtype.kind == "O":
+        present = (value for value in array if not _is_missing(value))
+        sample = np.array(list(islice(present, TIME_SERIES_SAMPLE_SIZE)), dtype=object)
     try:
         # Here we can omit the `[s]` to not cause unnecessary conversion work,
         # as the convertion to "datetime64[s]" is guaranteed to work later on,
         # if "datetime64" works.
-        np_array.astype("datetime64")
+        sample.astype("datetime64")
         return True
     except Exception:
         return False
 
 
-def _cast_as_numpy_floats(array: Any) -> NDArray:
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _cast_as_numpy(array: NDArray, is_time_series: bool) -> NDArray:
+    if is_time_series:
+        return _cast_as_numpy_time_series(array)
+    return _cast_as_numpy_numbers(array)
+
+
+def _cast_as_numpy_numbers(array: NDArray) -> NDArray:
     """
-    Attempts to make a numeric NumPy array from enumerable input.
+    Attempts to make a numeric NumPy array from a NumPy array.
 
-    If simply casting into a NumPy array yields one of `numpy.inexact`
-    floating-point type, it returns the array. Otherwise, it attempts to cast
-    it as NumPy float.
+    Arrays of a `numpy.inexact` floating-point type or of an integer type are
+    returned without copying, as they are rendered in their native type.
+    Otherwise, it attempts to cast it as NumPy float.
     """
-    numpy_array = np.array(array)
-    if np.issubdtype(numpy_array.dtype, np.inexact):
-        return numpy_array
+    if np.issubdtype(array.dtype, np.inexact) or np.issubdtype(array.dtype, np.integer):
+        return array
     # If it not already intitializes as a numeric type, then all we can do is
     # attempt to cast to float (including NaNs)
-    return numpy_array.astype(float)
+    return array.astype(float)
 
 
-def _cast_as_numpy_time_series(series: Any) -> NDArray:
+def _cast_as_numpy_time_series(array: NDArray) -> NDArray:
     """
     Converts to a numpy floating-point array, of unix epoch timestamps, with
     nano-second precision.
@@ -181,26 +301,58 @@ def _cast_as_numpy_time_series(series: Any) -> NDArray:
     # or a different type like "datetime64[m]" means that the conversion to
     # floating point will depend on the input format, which will lead to
     # unexpected behavior.
-    return np.array(series).astype("datetime64[s]").astype(float)
+    return array.astype("datetime64[s]").astype(float)
 
 
-def _safe_max(array: NDArray) -> float:
-    return array[~np.isnan(array)].max()
+def _nan_bounds(series: List[NDArray]) -> Tuple[float, float]:
+    """
+    Returns the minimum and maximum of all series, ignoring NaN values, or NaN
+    if there are no other values.
+
+    Both are computed in a single pass over chunks that fit into the CPU
+    cache, without the temporary copies that masking NaN values would need.
+    """
+    minimum, maximum = np.nan, np.nan
+    for row in series:
+        if isinstance(row, SerialIndex):
+            if len(row) > 0:
+                minimum = np.fmin(minimum, row.min())
+                maximum = np.fmax(maximum, row.max())
+            continue
+        for start in range(0, len(row), BOUNDS_CHUNK_SIZE):
+            chunk = row[start : start + BOUNDS_CHUNK_SIZE]
+            minimum = np.fmin(minimum, np.fmin.reduce(chunk))
+            maximum = np.fmax(maximum, np.fmax.reduce(chunk))
+    return (float(minimum), float(maximum))
 
 
-def _safe_maxs(series: List) -> float:
-    return max([_safe_max(row) for row in series if len(row) > 0])
+def _merged_bounds(
+    bounds: Tuple[float, float], other: Tuple[float, float]
+) -> Tuple[float, float]:
+    return (float(np.fmin(bounds[0], other[0])), float(np.fmax(bounds[1], other[1])))
 
 
-def _safe_mins(series: List) -> float:
-    return min([_safe_min(row) for row in series if len(row) > 0])
+def _checked_bound(bound: float) -> float:
+    if np.isnan(bound):
+        raise ValueError("Cannot determine bounds of series without any values.")
+    return bound
 
 
-def _safe_min(array: NDArray) -> float:
-    return array[~np.isnan(array)].min()
+def _concatenate(series: NDArray, other: NDArray) -> NDArray:
+    """
+    Concatenates two series, where a serial index that is continued by
+    another one stays a serial index.
+    """
+    if (
+        isinstance(series, SerialIndex)
+        and isinstance(other, SerialIndex)
+        and other.start == series.start + len(series)
+    ):
+        return SerialIndex(start=series.start, length=len(series) + len(other))
+    return np.concatenate((series, other))
 
 
 def _safe_log10(x: NDArray) -> NDArray:
-    x = x.astype(float)
+    x = np.array(x, dtype=float)
     x[x <= 0.0] = np.nan
     return np.log10(x)
@@ -31,6 +31,8 @@ class Options:
     character_set: CharacterSet = CharacterSet.BLOCK
     # Color mode
     color: Optional[List[Color]] = None
+    # Shade character cells by the number of points in them
+    density: bool = False
     # List of characters to use when plotting in force_ascii mode.
     force_ascii_characters: List[str] = field(default_factory=_default_ascii_characters)
     # Height of the plotting region, in lines
@@ -28,12 +28,13 @@ def validate_and_transform_options(series: MultiSeries, kwargs: Dict = {}) -> Op
     for key in ["x_min", "x_max", "y_min", "y_max"]:
         if key in kwargs:
             kwargs[key] = floatify(kwargs[key])
-    # TODO y gridlines
     if "x_gridlines" in kwargs:
         kwargs["x_gridlines"] = [floatify(x) for x in kwargs["x_gridlines"]]
     elif series.x_is_time_series:
         # Default to no x gridlines
         kwargs["x_gridlines"] = []
+    if "y_gridlines" in kwargs:
+        kwargs["y_gridlines"] = [floatify(y) for y in kwargs["y_gridlines"]]
 
     if kwargs.get("x_as_log"):
         series.set_x_axis_to_log10()
@@ -62,16 +63,15 @@ def validate_and_transform_options(series: MultiSeries, kwargs: Dict = {}) -> Op
     kwargs["y_gridlines_color"] = kwargs.get("y_gridlines_color", False)
     kwargs["y_gridlines_color"] = _init_color_from_arg(kwargs["y_gridlines_color"])
 
-    # Set x bounds to show all points by default
-    x_enlarge_delta = AUTO_WINDOW_ENLARGE_FACTOR * (
-        floatify(series.x_max()) - floatify(series.x_min())
-    )
-    kwargs["x_min"] = floatify(
-        kwargs.get("x_min", floatify(series.x_min()) - x_enlarge_delta)
-    )
-    kwargs["x_max"] = floatify(
-        kwargs.get("x_max", floatify(series.x_max()) + x_enlarge_delta)
-    )
+    # Set x bounds to show all points by default. The bounds of the series are
+    # only computed if they are needed.
+    if "x_min" not in kwargs or "x_max" not in kwargs:
+        x_min, x_max = floatify(series.x_min()), floatify(series.x_max())
+        x_enlarge_delta = AUTO_WINDOW_ENLARGE_FACTOR * (x_max - x_min)
+        kwargs.setdefault("x_min", x_min - x_enlarge_delta)
+        kwargs.setdefault("x_max", x_max + x_enlarge_delta)
+    kwargs["x_min"] = floatify(kwargs["x_min"])
+    kwargs["x_max"] = floatify(kwargs["x_max"])
 
     # Fallback for only a single data point, or multiple with single x
     # coordinate
@@ -80,9 +80,11 @@ def validate_and_transform_options(series: MultiSeries, kwargs: Dict = {}) -> Op
         kwargs["x_max"] = kwargs["x_max"] + 1
 
     # Set y bounds to show all points by default
-    y_enlarge_delta = AUTO_WINDOW_ENLARGE_FACTOR * (series.y_max() - series.y_min())
-    kwargs["y_min"] = kwargs.get("y_min", series.y_min() - y_enlarge_delta)
-    kwargs["y_max"] = kwargs.get("y_max", series.y_max() + y_enlarge_delta)
+    if "y_min" not in kwargs or "y_max" not in kwargs:
+        y_min, y_max = series.y_min(), series.y_max()
+        y_enlarge_delta = AUTO_WINDOW_ENLARGE_FACTOR * (y_max - y_min)
+        kwargs.setdefault("y_min", y_min - y_enlarge_delta)
+        kwargs.setdefault("y_max", y_max + y_enlarge_delta)
 
     # Fallback for only a single data point, or multiple with single y
     # coordinate
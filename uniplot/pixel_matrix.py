@@ -1,9 +1,15 @@
 import numpy as np
 from numpy.typing import NDArray
-from typing import Optional, Final
+from typing import Any, Iterator, List, Optional, Final, Sequence, Tuple
 
 
 BATCH_SIZE: Final = 10_000
+# Margin in pixels around the canvas used when clipping line segments
+CLIPPING_MARGIN: Final = 1.0
+# Largest rounding error, in pixels, for which pixel coordinates are computed
+# in single instead of double precision. Values within that error of a tie
+# between two pixels are computed again in double precision.
+FLOAT32_PIXEL_TOLERANCE: Final = 1e-3
 
 
 def render(
@@ -19,16 +25,112 @@ def render(
     pixels: Optional[NDArray] = None,
     layer: int = 1,
     batch_size: int = BATCH_SIZE,
-):
+    decimate: bool = True,
+    x_is_sorted: Optional[bool] = None,
+) -> NDArray:
+    """
+    Render points, and optionally the lines between them, into a pixel matrix.
+
+    This is `render_layers` for a single series.
+    """
+    return render_layers(
+        xs=[xs],
+        ys=[ys],
+        x_min=x_min,
+        x_max=x_max,
+        y_min=y_min,
+        y_max=y_max,
+        width=width,
+        height=height,
+        lines=[lines],
+        pixels=pixels,
+        layers=[layer],
+        batch_size=batch_size,
+        decimate=decimate,
+        x_is_sorted=[x_is_sorted],
+    )
+
+
+def render_layers(
+    xs: Sequence[Any],
+    ys: Sequence[Any],
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+    width: int,
+    height: int,
+    lines: Sequence[bool],
+    pixels: Optional[NDArray] = None,
+    layers: Optional[Sequence[int]] = None,
+    batch_size: int = BATCH_SIZE,
+    decimate: bool = True,
+    x_is_sorted: Optional[Sequence[Optional[bool]]] = None,
+) -> NDArray:
+    """
+    Render the points of several series, and optionally the lines between
+    them, into a pixel matrix. Each pixel holds the layer of the series drawn
+    there, which defaults to `1` for the first series, `2` for the second one,
+    and so on. Where series overlap, the highest layer is on top.
+
+    Short series are rendered together: their points are concatenated, and
+    the series of each point is kept in a separate array, so the cost per
+    series is small.
+
+    With `decimate`, line plots skip work that does not change the result:
+    Time series, i.e. `xs` sorted in ascending order, are drawn column by
+    column, and other data is reduced to a few points per pixel column. If
+    `x_is_sorted` is not supplied, it is determined from `xs`.
+    """
     if pixels is None:
         pixels = np.zeros((height, width), dtype=np.int32)
-
-    # Always render points
-    for start in range(0, len(xs), batch_size):
-        end = min(start + batch_size, len(xs))
-        pixels = _render_batch_of_dots(
-            xs=xs[start:end],
-            ys=ys[start:end],
+    if layers is None:
+        layers = range(1, len(xs) + 1)
+    if x_is_sorted is None:
+        x_is_sorted = [None] * len(xs)
+    # Integer bounds would make the pixel coordinates of integer values
+    # overflow
+    x_min, x_max, y_min, y_max = float(x_min), float(x_max), float(y_min), float(y_max)
+
+    envelopes: List[Tuple[Any, Any, int, bool]] = []
+    others: List[Tuple[Any, Any, int, bool]] = []
+    for x, y, layer, has_lines, series_is_sorted in zip(
+        xs, ys, layers, lines, x_is_sorted
+    ):
+        # For time series, lines can be drawn per pixel column directly
+        if has_lines and decimate and len(x) >= 2:
+            if series_is_sorted is None:
+                series_is_sorted = is_sorted(x)
+            if series_is_sorted and not np.isnan(y).any():
+                envelopes.append((x, y, layer, has_lines))
+                continue
+
+        # When drawing lines, many points per pixel column can be reduced to
+        # a few without changing the result
+        if has_lines and decimate and len(x) > 4 * width:
+            keep = np.concatenate(
+                [
+                    start
+                    + _decimate_line_points(
+                        xs=x[start : start + batch_size],
+                        ys=y[start : start + batch_size],
+                        x_min=x_min,
+                        x_max=x_max,
+                        width=width,
+                    )
+                    for start in range(0, len(x), batch_size)
+                ]
+            )
+            if len(keep) < len(x):
+                x, y = x[keep], y[keep]
+        others.append((x, y, layer, has_lines))
+
+    for xs_group, ys_group, offsets, layer_table, _ in _groups(envelopes, batch_size):
+        pixels = _render_column_envelopes(
+            xs=xs_group,
+            ys=ys_group,
+            offsets=offsets,
+            layers=layer_table,
             x_min=x_min,
             x_max=x_max,
             y_min=y_min,
@@ -36,30 +138,42 @@ def render(
             width=width,
             height=height,
             pixels=pixels,
-            layer=layer,
         )
 
-    # Optionally render lines
-    if lines and len(xs) >= 2:
-        valid = (
-            ~np.isnan(xs[:-1])
-            & ~np.isnan(xs[1:])
-            & ~np.isnan(ys[:-1])
-            & ~np.isnan(ys[1:])
-        )
-        xs0 = xs[:-1][valid]
-        xs1 = xs[1:][valid]
-        ys0 = ys[:-1][valid]
-        ys1 = ys[1:][valid]
-
-        for start in range(0, len(xs0), batch_size):
-            end = min(start + batch_size, len(xs0))
-            x_pairs = np.stack([xs0[start:end], xs1[start:end]], axis=1).reshape(-1)
-            y_pairs = np.stack([ys0[start:end], ys1[start:end]], axis=1).reshape(-1)
+    for xs_group, ys_group, offsets, layer_table, lines_table in _groups(
+        others, batch_size
+    ):
+        # Always render points
+        for start in range(0, len(xs_group), batch_size):
+            end = min(start + batch_size, len(xs_group))
+            batch_layers, _ = _batch_layers(
+                offsets, layer_table, lines_table, start=start, end=end
+            )
+            pixels = _render_batch_of_dots(
+                xs=xs_group[start:end],
+                ys=ys_group[start:end],
+                x_min=x_min,
+                x_max=x_max,
+                y_min=y_min,
+                y_max=y_max,
+                width=width,
+                height=height,
+                pixels=pixels,
+                layers=batch_layers,
+            )
 
+        # Optionally render lines
+        if not lines_table.any():
+            continue
+        for start in range(0, len(xs_group) - 1, batch_size):
+            # Batches of segments overlap by one point
+            end = min(start + batch_size + 1, len(xs_group))
+            batch_layers, connected = _batch_layers(
+                offsets, layer_table, lines_table, start=start, end=end
+            )
             pixels = _render_batch_of_lines(
-                xs=x_pairs,
-                ys=y_pairs,
+                xs=xs_group[start:end],
+                ys=ys_group[start:end],
                 x_min=x_min,
                 x_max=x_max,
                 y_min=y_min,
@@ -67,12 +181,118 @@ def render(
                 width=width,
                 height=height,
                 pixels=pixels,
-                layer=layer,
+                layers=batch_layers,
+                connected=connected,
             )
 
     return pixels
 
 
+def count_points(
+    xs: NDArray,
+    ys: NDArray,
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+    width: int,
+    height: int,
+    counts: Optional[NDArray] = None,
+    batch_size: int = BATCH_SIZE,
+) -> NDArray:
+    """
+    Count the points in each pixel, and add them to the `counts` matrix if
+    given. Unlike with `render`, every point is counted, not only the one that
+    is drawn last.
+    """
+    if counts is None:
+        counts = np.zeros((height, width), dtype=np.int64)
+    x_min, x_max, y_min, y_max = float(x_min), float(x_max), float(y_min), float(y_max)
+
+    for start in range(0, len(xs), batch_size):
+        end = min(start + batch_size, len(xs))
+        rows, columns, _ = _pixel_indices(
+            xs=xs[start:end],
+            ys=ys[start:end],
+            x_min=x_min,
+            x_max=x_max,
+            y_min=y_min,
+            y_max=y_max,
+            width=width,
+            height=height,
+        )
+        counts += np.bincount(rows * width + columns, minlength=width * height).reshape(
+            height, width
+        )
+    return counts
+
+
+def sparkline_spans(
+    series: List[NDArray], width: int, height: int
+) -> Tuple[NDArray, NDArray]:
+    """
+    Returns the lowest and highest pixel row, counted from the bottom, of each
+    of the `series` in each of `width` pixel columns, as two matrices with one
+    row per series. Every series spans all columns and is scaled to its own
+    range over `height` pixel rows.
+
+    All series are discretized together. Each column also reaches the first
+    value of the next column, such that the values are connected like lines.
+    Columns without any values other than NaN are NaN.
+    """
+    lengths = np.array([len(s) for s in series], dtype=np.intp)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    # A trailing NaN, such that every start index of `reduceat` is valid
+    values = np.concatenate([np.asarray(s, dtype=float) for s in series] + [[np.nan]])
+
+    series_min = np.fmin.reduceat(values, offsets[:-1])
+    v_min = np.repeat(series_min, lengths)
+    v_max = np.repeat(np.fmax.reduceat(values, offsets[:-1]), lengths)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rows = np.where(
+            v_max > v_min,
+            np.floor((values[:-1] - v_min) / (v_max - v_min) * height),
+            (height - 1) // 2,
+        )
+    # NaN values are not drawn, also not in constant series
+    rows[np.isnan(values[:-1])] = np.nan
+    rows = np.append(np.minimum(rows, height - 1), np.nan)
+
+    # The first value of each column of each series. If there are fewer values
+    # than columns, consecutive columns start at the same value, for which
+    # `reduceat` returns just that value.
+    starts = offsets[:-1, None] + np.arange(width) * lengths[:, None] // width
+    lows = np.fmin.reduceat(rows, starts.ravel()).reshape(starts.shape)
+    highs = np.fmax.reduceat(rows, starts.ravel()).reshape(starts.shape)
+    firsts = rows[starts[:, 1:]]
+    lows[:, :-1] = np.fmin(lows[:, :-1], firsts)
+    highs[:, :-1] = np.fmax(highs[:, :-1], firsts)
+
+    # Series without any values, or with only NaN values, are blank
+    is_blank = ((lengths == 0) | np.isnan(series_min))[:, None]
+    return np.where(is_blank, np.nan, lows), np.where(is_blank, np.nan, highs)
+
+
+def is_sorted(xs: NDArray) -> bool:
+    """
+    Check if the values are sorted in ascending order. Any NaN value means the
+    series is not considered sorted.
+    """
+    return bool(np.all(xs[1:] >= xs[:-1]))
+
+
+def pixel_columns(xs: NDArray, x_min: float, x_max: float, width: int) -> NDArray:
+    """
+    Returns the pixel column of each value. All columns left and right of the
+    canvas are merged into `-1` and `width`, respectively.
+    """
+    return np.clip(
+        _rounded_pixel_coordinates(xs, v_min=x_min, v_max=x_max, size=width),
+        -1,
+        width,
+    )
+
+
 def merge_on_top(
     low_layer: NDArray, high_layer: NDArray, width: int, height: int
 ) -> NDArray:
@@ -99,6 +319,71 @@ def merge_on_top(
 ###########
 
 
+def _groups(
+    series: List[Tuple[Any, Any, int, bool]], batch_size: int
+) -> Iterator[Tuple[Any, Any, NDArray, NDArray, NDArray]]:
+    """
+    Groups the `series`, given as tuples of xs, ys, layer and whether to draw
+    lines, into batches of about `batch_size` points, which are rendered in
+    one pass.
+
+    Yields the concatenated xs and ys of each group, the offsets where each of
+    its series starts, followed by the total number of points, and the layer
+    and line flag of each series. Series that are longer than `batch_size` form
+    a group of their own, so they are not copied.
+    """
+    group: List[Tuple[Any, Any, int, bool]] = []
+    nr_points = 0
+    for i, item in enumerate(series):
+        group.append(item)
+        nr_points += len(item[0])
+        is_last = i == len(series) - 1
+        if is_last or nr_points + len(series[i + 1][0]) > batch_size:
+            xs, ys, layers, lines = zip(*group)
+            yield (
+                _concatenate(xs),
+                _concatenate(ys),
+                np.concatenate([[0], np.cumsum([len(x) for x in xs])]),
+                np.array(layers, dtype=np.int32),
+                np.array(lines, dtype=bool),
+            )
+            group, nr_points = [], 0
+
+
+def _concatenate(arrays: Sequence[Any]) -> Any:
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def _batch_layers(
+    offsets: NDArray, layers: NDArray, lines: NDArray, start: int, end: int
+) -> Tuple[Any, Optional[NDArray]]:
+    """
+    Returns the layer of each point from `start` to `end` of a group of series
+    that start at the `offsets`, and whether each point is connected by a line
+    to the next one, which requires both to be of the same series.
+
+    For a group of a single series, returns just its layer, and `None` as all
+    points are connected.
+    """
+    if len(layers) == 1:
+        return int(layers[0]), None
+    series = np.repeat(np.arange(len(layers)), np.diff(np.clip(offsets, start, end)))
+    return layers[series], (series[1:] == series[:-1]) & lines[series[:-1]]
+
+
+def _draw(pixels: NDArray, rows: NDArray, columns: NDArray, layers: Any) -> None:
+    """
+    Draw the `layers` into the `pixels` at the `rows` and `columns`, where the
+    highest layer is on top.
+    """
+    if np.ndim(layers) == 0:
+        drawn = np.zeros(pixels.shape, dtype=bool)
+        drawn[rows, columns] = True
+        np.maximum(pixels, layers, out=pixels, where=drawn)
+    else:
+        np.maximum.at(pixels, (rows, columns), layers)
+
+
 def _render_batch_of_dots(
     xs: NDArray,
     ys: NDArray,
@@ -109,32 +394,302 @@ def _render_batch_of_dots(
     width: int,
     height: int,
     pixels: Optional[NDArray] = None,
-    layer: int = 1,
+    layers: Any = 1,
 ) -> NDArray:
+    """
+    Render points, where `layers` is either the layer of all points or an
+    array with the layer of each point.
+    """
     if pixels is None:
         pixels = np.zeros((height, width), dtype=np.int32)
 
-    if len(xs) == 0:
-        return pixels
-
-    valid = ~np.isnan(xs) & ~np.isnan(ys)
+    rows, columns, in_view = _pixel_indices(
+        xs=xs,
+        ys=ys,
+        x_min=x_min,
+        x_max=x_max,
+        y_min=y_min,
+        y_max=y_max,
+        width=width,
+        height=height,
+    )
+    _draw(pixels, rows, columns, layers if np.ndim(layers) == 0 else layers[in_view])
+    return pixels
 
-    xs_pix = (width - 1) * (xs[valid] - x_min) / (x_max - x_min)
-    ys_pix = (height - 1) * (ys[valid] - y_min) / (y_max - y_min)
 
-    xi = np.round(xs_pix).astype(int)
-    yi = np.round(ys_pix).astype(int)
+def _pixel_indices(
+    xs: NDArray,
+    ys: NDArray,
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+    width: int,
+    height: int,
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    Returns the row and column of the pixel of each point that is in view, and
+    the mask of these points. Points with NaN values are never in view.
+    """
+    xi = _rounded_pixel_coordinates(xs, v_min=x_min, v_max=x_max, size=width)
+    yi = _rounded_pixel_coordinates(ys, v_min=y_min, v_max=y_max, size=height)
     yi = height - 1 - yi  # flip Y for image coordinates
-    valid = (
-        (~np.isnan(xi))
-        & (xi >= 0)
-        & (xi < width)
-        & (~np.isnan(yi))
-        & (yi >= 0)
-        & (yi < height)
+    in_view = (xi >= 0) & (xi < width) & (yi >= 0) & (yi < height)
+    return (yi[in_view].astype(np.intp), xi[in_view].astype(np.intp), in_view)
+
+
+def _pixel_coordinates(
+    values: NDArray, v_min: float, v_max: float, size: int
+) -> NDArray:
+    """
+    Returns the (not yet rounded) pixel coordinates of the values along an axis
+    of `size` pixels, in double precision.
+    """
+    # Subtracting a Python float keeps the dtype of float32 values, so double
+    # precision is asked for explicitly
+    return (size - 1) * np.subtract(values, v_min, dtype=float) / (v_max - v_min)
+
+
+def _rounded_pixel_coordinates(
+    values: NDArray, v_min: float, v_max: float, size: int
+) -> NDArray:
+    """
+    Returns the pixel coordinates of the values along an axis of `size`
+    pixels, rounded to whole pixels. The result is identical to rounding
+    `_pixel_coordinates`.
+
+    Values of float32 and of integer types of up to 16 bits are exactly
+    representable as float32. For these, we compute in single precision, and
+    so avoid float64 copies of the values. Only the few values that are within
+    the rounding error of a tie between two pixels are computed again in
+    double precision, as single precision could round them the other way.
+    """
+    values = np.asarray(values)
+    if (values.dtype.kind in "iu" and values.dtype.itemsize <= 2) or (
+        values.dtype == np.float32
+    ):
+        # Bound of the rounding error of the bounds and of the operations, for
+        # all coordinates close enough to the canvas to matter
+        float32_error = (
+            4
+            * np.finfo(np.float32).eps
+            * ((size - 1) * max(abs(v_min), abs(v_max)) / (v_max - v_min) + size + 1)
+        )
+        if float32_error < FLOAT32_PIXEL_TOLERANCE:
+            coordinates = (
+                np.float32(size - 1)
+                * (values - np.float32(v_min))
+                / np.float32(v_max - v_min)
+            )
+            rounded = np.round(coordinates)
+            near_tie = np.abs(np.abs(coordinates - rounded) - 0.5) <= float32_error
+            if np.any(near_tie):
+                rounded[near_tie] = np.round(
+                    _pixel_coordinates(values[near_tie], v_min, v_max, size)
+                )
+            return rounded
+    return np.round(_pixel_coordinates(values, v_min=v_min, v_max=v_max, size=size))
+
+
+def _decimate_line_points(
+    xs: NDArray, ys: NDArray, x_min: float, x_max: float, width: int
+) -> NDArray:
+    """
+    Returns the indices of the points that are needed to render a line plot,
+    following the M4 aggregation idea.
+
+    Consecutive points that fall into the same pixel column form a run. A
+    line through a run covers exactly the pixels between its minimum and
+    maximum, so we only keep the first, minimum, maximum and last point of
+    each run. For data with monotonic x, each run is a whole pixel column.
+
+    Points with NaN values break lines, so they always form a run of their
+    own. Columns outside of the canvas are merged on both sides, as nothing
+    of what happens there is visible.
+    """
+    columns = pixel_columns(xs, x_min=x_min, x_max=x_max, width=width)
+    invalid = np.isnan(columns) | np.isnan(ys)
+    breaks = (columns[1:] != columns[:-1]) | invalid[1:] | invalid[:-1]
+
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    ends = np.append(starts[1:], len(xs)) - 1
+    if 4 * len(starts) >= len(xs):
+        # Barely any runs longer than a single point, so nothing to gain
+        return np.arange(len(xs))
+
+    run = np.concatenate(([0], np.cumsum(breaks)))
+    argmins = _first_index_per_run(ys == np.minimum.reduceat(ys, starts)[run], run)
+    argmaxs = _first_index_per_run(ys == np.maximum.reduceat(ys, starts)[run], run)
+
+    return np.unique(np.concatenate((starts, ends, argmins, argmaxs)))
+
+
+def _first_index_per_run(mask: NDArray, run: NDArray) -> NDArray:
+    """
+    Returns the first index per run where `mask` is `True`.
+    """
+    candidates = np.flatnonzero(mask)
+    is_first = np.diff(run[candidates], prepend=-1) != 0
+    return candidates[is_first]
+
+
+def _render_column_envelopes(
+    xs: Any,
+    ys: NDArray,
+    offsets: NDArray,
+    layers: NDArray,
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+    width: int,
+    height: int,
+    pixels: NDArray,
+) -> NDArray:
+    """
+    Render lines through points with sorted x coordinates and without NaN
+    values. Series `i` of the concatenated `xs` and `ys` starts at
+    `offsets[i]` and is drawn with `layers[i]`.
+
+    Within a pixel column, such a line covers exactly the span between the
+    minimum and maximum of the points in that column, so we fill these spans
+    directly. Only the segments that connect neighboring columns are
+    rasterized.
+    """
+    starts = _first_index_per_column(
+        xs=xs, offsets=offsets, x_min=x_min, x_max=x_max, width=width
+    )
+    span_layers = layers[np.searchsorted(offsets, starts, side="right") - 1]
+    span_columns = pixel_columns(
+        xs[starts], x_min=x_min, x_max=x_max, width=width
+    ).astype(int)
+
+    # Fill vertical spans of visible columns
+    lows = _rounded_pixel_coordinates(
+        np.minimum.reduceat(ys, starts), v_min=y_min, v_max=y_max, size=height
+    )
+    highs = _rounded_pixel_coordinates(
+        np.maximum.reduceat(ys, starts), v_min=y_min, v_max=y_max, size=height
+    )
+    visible = (
+        (span_columns >= 0) & (span_columns < width) & (highs >= 0) & (lows < height)
+    )
+    tops = height - 1 - np.minimum(highs[visible], height - 1).astype(int)
+    bottoms = height - 1 - np.maximum(lows[visible], 0).astype(int)
+    span_heights = bottoms - tops + 1
+    span_offsets = np.cumsum(span_heights) - span_heights
+    _draw(
+        pixels,
+        rows=np.repeat(tops - span_offsets, span_heights)
+        + np.arange(span_heights.sum()),
+        columns=np.repeat(span_columns[visible], span_heights),
+        layers=np.repeat(span_layers[visible], span_heights),
+    )
+
+    # Connect neighboring columns of the same series
+    is_connected = ~np.isin(starts[1:], offsets)
+    ends, starts = starts[1:][is_connected] - 1, starts[1:][is_connected]
+    x0, y0, x1, y1, inside = _clip_segments_to_canvas(
+        x0=_pixel_coordinates(xs[ends], v_min=x_min, v_max=x_max, size=width),
+        y0=_pixel_coordinates(ys[ends], v_min=y_min, v_max=y_max, size=height),
+        x1=_pixel_coordinates(xs[starts], v_min=x_min, v_max=x_max, size=width),
+        y1=_pixel_coordinates(ys[starts], v_min=y_min, v_max=y_max, size=height),
+        width=width,
+        height=height,
+    )
+    return _render_segments(
+        x0=x0,
+        y0=y0,
+        x1=x1,
+        y1=y1,
+        width=width,
+        height=height,
+        pixels=pixels,
+        layers=span_layers[1:][is_connected][inside],
+    )
+
+
+def _first_index_per_column(
+    xs: Any, offsets: NDArray, x_min: float, x_max: float, width: int
+) -> NDArray:
+    """
+    Returns the index of the first value of each non-empty pixel column of
+    each series, for sorted `xs` of series that start at the `offsets`.
+
+    This is a binary search for all columns of all series at once, so it only
+    evaluates the pixel column of a few values per column instead of all of
+    them.
+    """
+    columns = np.arange(-1, width + 1)
+    ends = np.broadcast_to(offsets[1:, None], (len(offsets) - 1, len(columns)))
+    lo = np.broadcast_to(offsets[:-1, None], ends.shape)
+    hi = ends
+    active = lo < hi
+    while np.any(active):
+        mid = (lo + hi) // 2
+        mid_columns = pixel_columns(
+            xs[np.minimum(mid, ends - 1)], x_min=x_min, x_max=x_max, width=width
+        )
+        go_right = mid_columns < columns
+        lo = np.where(active & go_right, mid + 1, lo)
+        hi = np.where(active & ~go_right, mid, hi)
+        active = lo < hi
+    return np.unique(lo[lo < ends])
+
+
+def _clip_segments_to_canvas(
+    x0: NDArray,
+    y0: NDArray,
+    x1: NDArray,
+    y1: NDArray,
+    width: int,
+    height: int,
+) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Clip line segments, given in pixel coordinates, to the canvas using the
+    Liang-Barsky algorithm. Returns the clipped segments, followed by the mask
+    of the segments that are kept.
+
+    Segments that are fully outside of the canvas are dropped, all others are
+    trimmed such that we never step through pixels far outside of the view.
+    We keep a margin of one pixel around the canvas, so that the pixels at the
+    border are rounded exactly as without clipping.
+    """
+    x_lo, x_hi = -CLIPPING_MARGIN, width - 1 + CLIPPING_MARGIN
+    y_lo, y_hi = -CLIPPING_MARGIN, height - 1 + CLIPPING_MARGIN
+
+    dx = x1 - x0
+    dy = y1 - y0
+    t_enter = np.zeros(len(x0))
+    t_exit = np.ones(len(x0))
+    inside = np.ones(len(x0), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in [
+            (-dx, x0 - x_lo),
+            (dx, x_hi - x0),
+            (-dy, y0 - y_lo),
+            (dy, y_hi - y0),
+        ]:
+            # Segments parallel to this edge and outside of it are dropped
+            inside &= (p != 0) | (q >= 0)
+            ratio = q / p
+            entering = p < 0
+            leaving = p > 0
+            t_enter[entering] = np.maximum(t_enter[entering], ratio[entering])
+            t_exit[leaving] = np.minimum(t_exit[leaving], ratio[leaving])
+
+    inside &= t_enter <= t_exit
+    x0, y0, dx, dy = x0[inside], y0[inside], dx[inside], dy[inside]
+    t_enter, t_exit = t_enter[inside], t_exit[inside]
+
+    return (
+        x0 + t_enter * dx,
+        y0 + t_enter * dy,
+        x0 + t_exit * dx,
+        y0 + t_exit * dy,
+        inside,
     )
-    pixels[yi[valid], xi[valid]] = layer
-    return pixels
 
 
 def _render_batch_of_lines(
@@ -147,99 +702,92 @@ def _render_batch_of_lines(
     width: int,
     height: int,
     pixels: Optional[NDArray] = None,
-    layer: int = 1,
+    layers: Any = 1,
+    connected: Optional[NDArray] = None,
 ) -> NDArray:
+    """
+    Render the line segments that connect consecutive points, except where
+    `connected` is `False`. The `layers` are either the layer of all points or
+    an array with the layer of each point.
+    """
     if pixels is None:
         pixels = np.zeros((height, width), dtype=np.int32)
 
-    if len(xs) == 0:
+    if len(xs) < 2:
         return pixels
 
-    xs_pix = (width - 1) * (xs - x_min) / (x_max - x_min)
-    ys_pix = (height - 1) * (ys - y_min) / (y_max - y_min)
+    xs_pix = _pixel_coordinates(xs, v_min=x_min, v_max=x_max, size=width)
+    ys_pix = _pixel_coordinates(ys, v_min=y_min, v_max=y_max, size=height)
+
+    valid = (
+        ~np.isnan(xs_pix[:-1])
+        & ~np.isnan(xs_pix[1:])
+        & ~np.isnan(ys_pix[:-1])
+        & ~np.isnan(ys_pix[1:])
+    )
+    if connected is not None:
+        valid &= connected
+    x0, y0, x1, y1, inside = _clip_segments_to_canvas(
+        x0=xs_pix[:-1][valid],
+        y0=ys_pix[:-1][valid],
+        x1=xs_pix[1:][valid],
+        y1=ys_pix[1:][valid],
+        width=width,
+        height=height,
+    )
 
-    x0, x1 = xs_pix[::2], xs_pix[1::2]
-    y0, y1 = ys_pix[::2], ys_pix[1::2]
+    return _render_segments(
+        x0=x0,
+        y0=y0,
+        x1=x1,
+        y1=y1,
+        width=width,
+        height=height,
+        pixels=pixels,
+        layers=layers if np.ndim(layers) == 0 else layers[:-1][valid][inside],
+    )
 
-    valid = ~np.isnan(x0) & ~np.isnan(x1) & ~np.isnan(y0) & ~np.isnan(y1)
-    x0, x1 = x0[valid], x1[valid]
-    y0, y1 = y0[valid], y1[valid]
 
+def _render_segments(
+    x0: NDArray,
+    y0: NDArray,
+    x1: NDArray,
+    y1: NDArray,
+    width: int,
+    height: int,
+    pixels: NDArray,
+    layers: Any = 1,
+) -> NDArray:
+    """
+    Render line segments from `(x0, y0)` to `(x1, y1)`, given in pixel
+    coordinates, where `layers` is either the layer of all segments or an
+    array with the layer of each segment.
+    """
     dx = x1 - x0
     dy = y1 - y0
     steep = np.abs(dy) > np.abs(dx)
 
-    all_x, all_y = [], []
+    all_x, all_y, all_segments = [], [], []
 
-    # Shallow lines
+    # Shallow lines, which we step through along the x axis
     mask = ~steep
     if np.any(mask):
-        x0s, x1s = x0[mask], x1[mask]
-        y0s, y1s = y0[mask], y1[mask]
-
-        swap = x0s > x1s
-        x0s[swap], x1s[swap] = x1s[swap], x0s[swap]
-        y0s[swap], y1s[swap] = y1s[swap], y0s[swap]
-
-        n = np.maximum(np.round(x1s - x0s).astype(int) + 1, 1)
-        steps = np.arange(n.max())
-        steps = steps[None, :] * np.ones((len(n), 1))
-        mask_steps = steps < n[:, None]
-
-        x_vals = np.round(x0s)[:, None] + steps
-        safe_dx = x1s - x0s
-        safe_dx[safe_dx == 0] = 1
-        t = (x_vals - x0s[:, None]) / safe_dx[:, None]
-        y_vals = y0s[:, None] + t * (y1s - y0s)[:, None]
-
-        x_vals = np.clip(
-            x_vals,
-            np.minimum(x0s[:, None], x1s[:, None]),
-            np.maximum(x0s[:, None], x1s[:, None]),
-        )
-        y_vals = np.clip(
-            y_vals,
-            np.minimum(y0s[:, None], y1s[:, None]),
-            np.maximum(y0s[:, None], y1s[:, None]),
+        x_vals, y_vals, segments = _expand_segments_along_major_axis(
+            major0=x0[mask], minor0=y0[mask], major1=x1[mask], minor1=y1[mask]
         )
+        all_x.append(x_vals)
+        all_y.append(y_vals)
+        all_segments.append(np.flatnonzero(mask)[segments])
 
-        all_x.append(x_vals[mask_steps])
-        all_y.append(y_vals[mask_steps])
-
-    # Steep lines
+    # Steep lines, which we step through along the y axis
     mask = steep
     if np.any(mask):
-        x0s, x1s = x0[mask], x1[mask]
-        y0s, y1s = y0[mask], y1[mask]
-
-        swap = y0s > y1s
-        x0s[swap], x1s[swap] = x1s[swap], x0s[swap]
-        y0s[swap], y1s[swap] = y1s[swap], y0s[swap]
-
-        n = np.maximum(np.round(y1s - y0s).astype(int) + 1, 1)
-        steps = np.arange(n.max())
-        steps = steps[None, :] * np.ones((len(n), 1))
-        mask_steps = steps < n[:, None]
-
-        y_vals = np.round(y0s)[:, None] + steps
-        safe_dy = y1s - y0s
-        safe_dy[safe_dy == 0] = 1
-        t = (y_vals - y0s[:, None]) / safe_dy[:, None]
-        x_vals = x0s[:, None] + t * (x1s - x0s)[:, None]
-
-        y_vals = np.clip(
-            y_vals,
-            np.minimum(y0s[:, None], y1s[:, None]),
-            np.maximum(y0s[:, None], y1s[:, None]),
+        y_vals, x_vals, segments = _expand_segments_along_major_axis(
+            major0=y0[mask], minor0=x0[mask], major1=y1[mask], minor1=x1[mask]
         )
-        x_vals = np.clip(
-            x_vals,
-            np.minimum(x0s[:, None], x1s[:, None]),
-            np.maximum(x0s[:, None], x1s[:, None]),
-        )
-
-        all_x.append(x_vals[mask_steps])
-        all_y.append(y_vals[mask_steps])
+        all_x.append(x_vals)
+        all_y.append(y_vals)
+        all_segments.append(np.flatnonzero(mask)[segments])
 
     if not all_x:
         return pixels
@@ -249,6 +797,46 @@ def _render_batch_of_lines(
     y_all = height - 1 - y_all
 
     valid = (x_all >= 0) & (x_all < width) & (y_all >= 0) & (y_all < height)
-    pixels[y_all[valid], x_all[valid]] = layer
+    if np.ndim(layers) > 0:
+        layers = layers[np.concatenate(all_segments)[valid]]
+    _draw(pixels, y_all[valid], x_all[valid], layers)
 
     return pixels
+
+
+def _expand_segments_along_major_axis(
+    major0: NDArray, minor0: NDArray, major1: NDArray, minor1: NDArray
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    Expand line segments into the (not yet rounded) coordinates of the pixels
+    they cover, stepping one pixel at a time along the major axis. Also
+    returns the index of the segment of each pixel.
+
+    The steps of all segments are laid out back to back in flat arrays, so the
+    cost is proportional to the total number of pixels drawn, and not to the
+    number of segments times the length of the longest one.
+    """
+    swap = major0 > major1
+    major0, major1 = np.where(swap, major1, major0), np.where(swap, major0, major1)
+    minor0, minor1 = np.where(swap, minor1, minor0), np.where(swap, minor0, minor1)
+
+    n = np.maximum(np.round(major1 - major0).astype(int) + 1, 1)
+    segment = np.repeat(np.arange(len(n)), n)
+    offsets = np.cumsum(n) - n
+    steps = np.arange(len(segment)) - offsets[segment]
+
+    major0, major1 = major0[segment], major1[segment]
+    minor0, minor1 = minor0[segment], minor1[segment]
+
+    major_vals = np.round(major0) + steps
+    safe_delta = major1 - major0
+    safe_delta[safe_delta == 0] = 1
+    t = (major_vals - major0) / safe_delta
+    minor_vals = minor0 + t * (minor1 - minor0)
+
+    major_vals = np.clip(major_vals, major0, major1)
+    minor_vals = np.clip(
+        minor_vals, np.minimum(minor0, minor1), np.maximum(minor0, minor1)
+    )
+
+    return (major_vals, minor_vals, segment)
@@ -1,17 +1,20 @@
-import sys
 import numpy as np
 from numpy.typing import NDArray
-from typing import List, Tuple, Optional, Final, Any
+from typing import List, Dict, Tuple, Optional, Final, Any
 
 from uniplot.character_sets import CharacterSet
 from uniplot.legend_placements import LegendPlacement
+from uniplot.surface import Surface
 import uniplot.colors as colors
 
 
-CURSOR_UP_ONE: Final = "\x1b[1A"
 ERASE_LINE: Final = "\x1b[2K"
+# Terminals that support synchronized output show all changes in between at once
+BEGIN_SYNCHRONIZED_UPDATE: Final = "\x1b[?2026h"
+END_SYNCHRONIZED_UPDATE: Final = "\x1b[?2026l"
 
 LEGEND_VERTICAL_SPACING: Final = 3
+CELL_UPDATE_MAX_GAP: Final = 4
 
 
 def legend(
@@ -43,22 +46,29 @@ def legend(
         label_strings.append(label_string)
 
     if legend_placement == LegendPlacement.AUTO:
-        # If possible, group multiple labels into a single line
-        i = 1  # start at 2nd label
-        while i < len(label_strings):
-            len_previous_label = _effective_len(label_strings[i - 1])
-            len_current_label = _effective_len(label_strings[i])
-            if len_previous_label + LEGEND_VERTICAL_SPACING + len_current_label < width:
-                # We can merge these lines
-                label_strings[i - 1] = (
-                    label_strings[i - 1]
-                    + (" " * LEGEND_VERTICAL_SPACING)
-                    + label_strings[i]
-                )
-                del label_strings[i]
+        # If possible, group multiple labels into a single line. The length of
+        # each label is only measured once, so this takes linear time.
+        spacing = " " * LEGEND_VERTICAL_SPACING
+        lines: List[str] = []
+        line_labels: List[str] = []
+        line_length = 0
+        for label_string in label_strings:
+            label_length = _effective_len(label_string)
+            if (
+                line_labels
+                and line_length + LEGEND_VERTICAL_SPACING + label_length < width
+            ):
+                # We can merge this label into the current line
+                line_labels.append(label_string)
+                line_length += LEGEND_VERTICAL_SPACING + label_length
             else:
-                # We cannot merge these lines
-                i += 1
+                # We cannot merge this label, so it starts a new line
+                if line_labels:
+                    lines.append(spacing.join(line_labels))
+                line_labels = [label_string]
+                line_length = label_length
+        lines.append(spacing.join(line_labels))
+        label_strings = lines
 
     full_label_string = "\n".join(label_strings)
 
@@ -78,14 +88,69 @@ def plot_title(title: str, width: int, line_length_hard_cap: Optional[int]) -> s
     return _center_block_if_possible(title, width + 2, line_length_hard_cap)
 
 
-def erase_previous_lines(nr_lines: int) -> None:
+def redraw_lines(
+    previous_lines: List[str],
+    lines: List[str],
+    line_updates: Optional[Dict[int, str]] = None,
+) -> str:
+    """
+    Returns the terminal codes to replace the `previous_lines` right above the
+    cursor by `lines`, where only the lines that changed are rewritten.
+
+    Optionally, `line_updates` holds the codes to update a line in place,
+    starting and ending at its first column. They are used instead of
+    rewriting the line if they are shorter.
     """
-    This used terminal codes to erase the last `nr_lines` lines.
+    line_updates = line_updates or {}
+    output = BEGIN_SYNCHRONIZED_UPDATE + _cursor_up(len(previous_lines))
+    nr_unchanged_lines = 0
+    for i, line in enumerate(lines):
+        if i < len(previous_lines) and previous_lines[i] == line:
+            nr_unchanged_lines += 1
+            continue
+        output += _cursor_down(nr_unchanged_lines)
+        rewrite = ERASE_LINE + line + "\n"
+        if i in line_updates and len(line_updates[i]) < len(rewrite):
+            output += line_updates[i]
+            nr_unchanged_lines = 1
+        else:
+            output += rewrite
+            nr_unchanged_lines = 0
+    output += _cursor_down(nr_unchanged_lines)
+
+    # Erase the previous lines that are left below
+    nr_lines_left = len(previous_lines) - len(lines)
+    if nr_lines_left > 0:
+        output += (ERASE_LINE + "\n") * nr_lines_left + _cursor_up(nr_lines_left)
+
+    return output + END_SYNCHRONIZED_UPDATE
+
+
+def cell_updates(
+    previous_surface: Surface, surface: Surface, column_offset: int
+) -> Dict[int, str]:
     """
-    for _ in range(nr_lines):
-        sys.stdout.write(ERASE_LINE)
-        sys.stdout.write(CURSOR_UP_ONE)
-        sys.stdout.write(ERASE_LINE)
+    Returns the terminal codes to update each changed row of the
+    `previous_surface` in place, by only rewriting the cells that changed.
+    `column_offset` is the terminal column of the first cell of the surface.
+    """
+    changed = surface.changed_cells(previous_surface)
+    if changed is None:
+        return {}
+
+    updates: Dict[int, str] = {}
+    for row in np.flatnonzero(changed.any(axis=1)).tolist():
+        columns = np.flatnonzero(changed[row])
+        # Cells that are close to each other are rewritten together, because
+        # moving the cursor costs about as much as a few cells
+        run_starts = np.flatnonzero(np.diff(columns) > CELL_UPDATE_MAX_GAP) + 1
+        update = ""
+        for run in np.split(columns, run_starts):
+            start, end = int(run[0]), int(run[-1]) + 1
+            update += _cursor_to_column(column_offset + start)
+            update += surface.cells(row, start=start, end=end)
+        updates[row] = update + "\r"
+    return updates
 
 
 def prepare_histogram(
@@ -151,6 +216,18 @@ def count_lines(text: str) -> int:
 ###########
 
 
+def _cursor_up(nr_lines: int) -> str:
+    return f"\x1b[{nr_lines}A" if nr_lines > 0 else ""
+
+
+def _cursor_down(nr_lines: int) -> str:
+    return f"\x1b[{nr_lines}B" if nr_lines > 0 else ""
+
+
+def _cursor_to_column(column: int) -> str:
+    return f"\x1b[{column + 1}G"
+
+
 def _center_each_line_if_possible(
     text: str, width: int, line_length_hard_cap: Optional[int]
 ) -> str:
@@ -0,0 +1,71 @@
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Iterator
+
+from uniplot.serial_index import SerialIndex
+
+
+class RingBuffer:
+    """
+    A series of numbers with a fixed capacity, where appending more values
+    than fit drops the oldest ones.
+
+    It can be passed to `plot_gen` as `ys` or `xs` as is, without converting
+    it to a new array for every frame. If no `xs` are given, the serial index
+    continues with every value appended, so the view slides along with the
+    values.
+    """
+
+    def __init__(self, capacity: int, dtype: Any = float) -> None:
+        if capacity < 1:
+            raise ValueError("The capacity of a ring buffer must be at least 1.")
+        self.capacity: int = capacity
+        # The number of values appended since the buffer was created
+        self.nr_appended: int = 0
+        # Each value is stored twice, such that all values are always
+        # available as one contiguous view
+        self._data: NDArray = np.zeros(2 * capacity, dtype=dtype)
+        self._end: int = 0
+
+    def __len__(self) -> int:
+        return min(self.nr_appended, self.capacity)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.values())
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> NDArray:
+        values = self.values()
+        return values if dtype is None else values.astype(dtype)
+
+    def append(self, value: Any) -> None:
+        self.extend([value])
+
+    def extend(self, values: Any) -> None:
+        """
+        Append all `values`, of which only the last `capacity` ones are kept.
+        """
+        values = np.asarray(values, dtype=self._data.dtype)
+        nr_values = len(values)
+        values = values[-self.capacity :]
+        positions = (self._end + np.arange(len(values))) % self.capacity
+        self._data[positions] = values
+        self._data[positions + self.capacity] = values
+        self._end = (self._end + len(values)) % self.capacity
+        self.nr_appended += nr_values
+
+    def values(self) -> NDArray:
+        """
+        Returns the values from the oldest to the newest, as a read-only view
+        into the buffer.
+        """
+        start = (self._end - len(self)) % self.capacity
+        values = self._data[start : start + len(self)]
+        values.flags.writeable = False
+        return values
+
+    def index(self) -> SerialIndex:
+        """
+        Returns the serial index of the values, counting from the first value
+        ever appended, starting at 1.
+        """
+        return SerialIndex(start=self.nr_appended - len(self) + 1, length=len(self))
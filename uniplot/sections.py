@@ -1,8 +1,9 @@
 from numpy.typing import NDArray
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from uniplot.multi_series import MultiSeries
 from uniplot.options import Options
+from uniplot.surface import Surface
 import uniplot.layer_assembly as layer_assembly
 import uniplot.plot_elements as elements
 from uniplot.axis_labels.extended_talbot_labels import extended_talbot_labels
@@ -29,7 +30,7 @@ def generate_header(options: Options) -> List[str]:
 def generate_body(
     x_axis_labels: str,
     y_axis_labels: List[str],
-    pixel_character_matrix: NDArray,
+    surface: Surface,
     options: Options,
 ) -> List[str]:
     """
@@ -43,8 +44,8 @@ def generate_body(
     else:
         lines.append(f"┌{'─' * options.width}┐")
     # Body
-    for y_label, row in zip(y_axis_labels, pixel_character_matrix):
-        row = ("│" + "".join(row) + "│ " + y_label).rstrip()
+    for y_label, row in zip(y_axis_labels, surface.rows()):
+        row = ("│" + row + "│ " + y_label).rstrip()
         lines.append(row)
     # Bottom
     if options.rounded_corners:
@@ -73,10 +74,19 @@ def generate_body(
 
 
 def generate_body_raw_elements(
-    series: MultiSeries, options: Options
-) -> Tuple[str, List[str], NDArray]:
+    series: MultiSeries,
+    options: Options,
+    pixels: Optional[NDArray] = None,
+    new_points_from: Optional[List[int]] = None,
+    counts: Optional[NDArray] = None,
+) -> Tuple[str, List[str], Surface]:
     """
-    Generates the x-axis labels, y-axis labels, and the pixel character matrix.
+    Generates the x-axis labels, y-axis labels, and the graph surface.
+
+    If the `pixels` of the points up to `new_points_from` of each series are
+    given, only the new points are rendered and added to them. If `counts`
+    per character cell are given, they are rendered as a heatmap instead of
+    the points.
     """
     # Prepare y axis labels
     y_axis_labels = [""] * options.height
@@ -125,8 +135,61 @@ def generate_body_raw_elements(
             x_axis_labels = x_axis_label_set.render()[0]
 
     # Prepare graph surface
-    pixel_character_matrix = layer_assembly.assemble_scatter_plot(
-        xs=series.xs, ys=series.ys, options=options
-    )
+    if counts is not None:
+        surface = layer_assembly.assemble_heatmap(counts, options=options)
+    elif pixels is not None and new_points_from is not None:
+        # Start at the last point that is already rendered, to connect lines
+        starts = [max(i - 1, 0) for i in new_points_from]
+        surface = layer_assembly.assemble_scatter_plot(
+            xs=[x[start:] for x, start in zip(series.xs, starts)],
+            ys=[y[start:] for y, start in zip(series.ys, starts)],
+            options=options,
+            x_is_sorted=series.x_is_sorted,
+            pixels=pixels,
+        )
+    else:
+        surface = layer_assembly.assemble_scatter_plot(
+            xs=series.xs,
+            ys=series.ys,
+            options=options,
+            x_is_sorted=series.x_is_sorted,
+            pyramids=series.pyramids,
+        )
+
+    return (x_axis_labels, y_axis_labels, surface)
+
+
+def generate_image_axis_labels(
+    nr_rows: int, nr_columns: int, options: Options
+) -> Tuple[str, List[str]]:
+    """
+    Generates the x-axis and y-axis labels of an image, which are the column
+    and row indices of its cells. The first row is at the top.
+    """
+    y_axis_labels = [""] * options.height
+    if options.y_labels:
+        y_axis_label_set = extended_talbot_labels(
+            x_min=-0.5,
+            x_max=nr_rows - 0.5,
+            available_space=options.height,
+            vertical_direction=True,
+            integers=True,
+        )
+        if y_axis_label_set is not None:
+            # The labels are rendered from the bottom up, so reversing them
+            # counts the rows from the top down
+            y_axis_labels = y_axis_label_set.render()[::-1]
+
+    x_axis_labels = ""
+    if options.x_labels:
+        x_axis_label_set = extended_talbot_labels(
+            x_min=-0.5,
+            x_max=nr_columns - 0.5,
+            available_space=options.width,
+            vertical_direction=False,
+            integers=True,
+        )
+        if x_axis_label_set is not None:
+            x_axis_labels = x_axis_label_set.render()[0]
 
-    return (x_axis_labels, y_axis_labels, pixel_character_matrix)
+    return (x_axis_labels, y_axis_labels)
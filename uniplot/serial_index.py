@@ -0,0 +1,92 @@
+import math
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+from numpy.typing import NDArray
+from typing import Any
+
+
+class SerialIndex(NDArrayOperatorsMixin):
+    """
+    The consecutive integers `start, start + 1, ...` with the given `length`,
+    used as x values for series that are plotted without `xs`.
+
+    The values are only computed for the parts of the index that are actually
+    accessed. Slices of the index are index ranges again, and the bounds and a
+    binary search are simple arithmetic. For everything else, it behaves like
+    a NumPy array.
+    """
+
+    def __init__(self, start: int, length: int) -> None:
+        self.start: int = start
+        self.length: int = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"SerialIndex(start={self.start}, length={self.length})"
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> NDArray:
+        return np.arange(self.start, self.start + self.length, dtype=dtype or int)
+
+    def __array_ufunc__(
+        self, ufunc: Any, method: Any, /, *inputs: Any, **kwargs: Any
+    ) -> Any:
+        inputs = tuple(
+            np.asarray(value) if isinstance(value, SerialIndex) else value
+            for value in inputs
+        )
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __add__(self, other: Any) -> Any:
+        # Shifting the index by an integer keeps it an index range
+        if isinstance(other, (int, np.integer)):
+            return SerialIndex(start=self.start + int(other), length=self.length)
+        return super().__add__(other)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step == 1:
+                return SerialIndex(
+                    start=self.start + start, length=max(stop - start, 0)
+                )
+            return self.start + np.arange(start, stop, step)
+        if isinstance(key, (int, np.integer)):
+            if not -self.length <= key < self.length:
+                raise IndexError(f"Index {key} is out of bounds for {self}.")
+            return self.start + int(key) % self.length
+
+        key = np.asarray(key)
+        if key.dtype == bool:
+            return self.start + np.flatnonzero(key)
+        if np.any((key < -self.length) | (key >= self.length)):
+            raise IndexError(f"Index out of bounds for {self}.")
+        return self.start + key % self.length
+
+    def min(self) -> int:
+        return self.start
+
+    def max(self) -> int:
+        return self.start + self.length - 1
+
+    def searchsorted(self, values: Any, side: str = "left", sorter: Any = None) -> Any:
+        """
+        Returns the indices where the `values` would be inserted to keep the
+        index sorted, like `numpy.searchsorted`.
+        """
+        if np.ndim(values) == 0:
+            # Plain arithmetic, as this is called for every series and frame
+            offset = float(values) - self.start
+            if not math.isfinite(offset):
+                return 0 if offset < 0 else self.length
+            position = math.ceil(offset) if side == "left" else math.floor(offset) + 1
+            return min(max(position, 0), self.length)
+
+        offsets = np.asarray(values, dtype=float) - self.start
+        with np.errstate(invalid="ignore"):
+            positions = np.ceil(offsets) if side == "left" else np.floor(offsets) + 1
+            positions = np.where(
+                np.isnan(positions), self.length, np.clip(positions, 0, self.length)
+            ).astype(int)
+        return positions if positions.ndim > 0 else int(positions)
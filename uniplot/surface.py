@@ -0,0 +1,198 @@
+import numpy as np
+from numpy.typing import NDArray
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional, Final, Tuple
+
+from uniplot.colors import Color, COLOR_RESET_CODE
+
+GRIDLINE_CHARACTERS: Final[List[str]] = ["▔", "─", "▁", "│"]
+DECODER_CACHE_SIZE: Final = 64
+
+
+@dataclass
+class Surface:
+    """
+    The graph surface, with one glyph ID and one color ID per character cell.
+
+    The IDs refer to the lookup tables `glyphs` and `colors`, where the
+    latter holds the ANSI escape codes that enable a color. ID `0` is a blank
+    cell and no color, respectively. Strings are only assembled when the
+    surface is finally rendered into rows.
+
+    Every cell also stores the priority of the element that was drawn last,
+    such that all elements can be drawn into the same surface in any order.
+
+    Optionally, `pixels` keeps the full resolution pixels of the points, such
+    that more points can be added later without rendering all points again.
+    """
+
+    glyph_ids: NDArray
+    color_ids: NDArray
+    priorities: NDArray
+    glyphs: Tuple[str, ...]
+    colors: Tuple[str, ...]
+    pixels: Optional[NDArray] = None
+
+    @classmethod
+    def blank(
+        cls, width: int, height: int, glyphs: List[str], colors: List[Color]
+    ) -> "Surface":
+        """
+        Initialize an empty surface. The blank glyph and the disabled color
+        are added to the lookup tables automatically.
+        """
+        color_table = [""]
+        for color in colors:
+            if color.is_enabled() and color.enable_str() not in color_table:
+                color_table.append(color.enable_str())
+
+        return cls(
+            glyph_ids=np.zeros((height, width), dtype=np.uint16),
+            color_ids=np.zeros((height, width), dtype=np.uint16),
+            priorities=np.zeros((height, width), dtype=np.uint8),
+            glyphs=(" ", *glyphs),
+            colors=tuple(color_table),
+        )
+
+    def glyph_id(self, glyph: str) -> int:
+        return self.glyphs.index(glyph)
+
+    def color_id(self, color: Optional[Color]) -> int:
+        if color is None or not color.is_enabled():
+            return 0
+        return self.colors.index(color.enable_str())
+
+    def draw(
+        self,
+        rows: Any,
+        columns: Any,
+        glyph_ids: Any,
+        color_ids: Any = 0,
+        priority: int = 0,
+    ) -> None:
+        """
+        Draw glyphs into the cells at the `rows` and `columns` indices, except
+        for the cells that hold an element of higher priority. Of elements of
+        equal priority, the one drawn last is on top.
+        """
+        rows, columns, glyph_ids, color_ids = np.broadcast_arrays(
+            rows, columns, glyph_ids, color_ids
+        )
+        on_top = self.priorities[rows, columns] <= priority
+        rows, columns = rows[on_top], columns[on_top]
+        self.glyph_ids[rows, columns] = glyph_ids[on_top]
+        self.color_ids[rows, columns] = color_ids[on_top]
+        self.priorities[rows, columns] = priority
+
+    def to_character_matrix(self) -> NDArray:
+        """
+        Returns a NumPy array with the (colored) string of each character cell.
+        """
+        return _decoder(self.glyphs, self.colors)[self.color_ids, self.glyph_ids]
+
+    def rows(self) -> List[str]:
+        """
+        Returns the rendered rows of the surface.
+
+        Runs of cells of the same color share a single pair of escape codes.
+        Blank cells between two cells of the same color join their run, as
+        the color of a blank cell is not visible anyway.
+        """
+        return [
+            self.cells(row, start=0, end=self.glyph_ids.shape[1])
+            for row in range(self.glyph_ids.shape[0])
+        ]
+
+    def cells(self, row: int, start: int, end: int) -> str:
+        """
+        Returns the rendered cells from `start` to `end` of a row, where runs
+        of cells of the same color share a single pair of escape codes.
+        """
+        glyph_ids = self.glyph_ids[row, start:end]
+        characters = _decoder(self.glyphs, self.colors)[0][glyph_ids]
+        run_color_ids = _run_color_ids(
+            glyph_ids[None, :], self.color_ids[row, None, start:end]
+        )[0]
+
+        run_starts = np.flatnonzero(np.diff(run_color_ids, prepend=-1))
+        run_ends = np.append(run_starts[1:], len(run_color_ids))
+        text = ""
+        for run_start, run_end in zip(run_starts, run_ends):
+            run_text = "".join(characters[run_start:run_end])
+            color_id = run_color_ids[run_start]
+            if color_id > 0 and self.colors[color_id]:
+                run_text = self.colors[color_id] + run_text + COLOR_RESET_CODE
+            text += run_text
+        return text
+
+    def changed_cells(self, previous: "Surface") -> Optional[NDArray]:
+        """
+        Returns the mask of the cells that differ from the `previous` surface,
+        or `None` if the surfaces cannot be compared cell by cell.
+        """
+        if (
+            previous.glyph_ids.shape != self.glyph_ids.shape
+            or previous.glyphs != self.glyphs
+            or previous.colors != self.colors
+        ):
+            return None
+        return (previous.glyph_ids != self.glyph_ids) | (
+            (previous.color_ids != self.color_ids) & (self.glyph_ids > 0)
+        )
+
+
+###########
+# private #
+###########
+
+
+@lru_cache(maxsize=DECODER_CACHE_SIZE)
+def _decoder(glyphs: Tuple[str, ...], colors: Tuple[str, ...]) -> NDArray:
+    """
+    Returns the table of the (colored) string of each pair of color and glyph
+    ID. The table only depends on the character set and the colors, so it is
+    cached across frames.
+    """
+    decoder = np.array(
+        [
+            [
+                enable_str + glyph + COLOR_RESET_CODE
+                if enable_str and glyph_id > 0
+                else glyph
+                for glyph_id, glyph in enumerate(glyphs)
+            ]
+            for enable_str in colors
+        ]
+    )
+    decoder.flags.writeable = False
+    return decoder
+
+
+def _run_color_ids(glyph_ids: NDArray, color_ids: NDArray) -> NDArray:
+    """
+    Returns the color ID of each cell, where blank cells get the color of
+    their neighbors if the previous and next non-blank cell in the row have
+    the same color, and no color otherwise.
+    """
+    height, width = glyph_ids.shape
+    is_blank = glyph_ids == 0
+    columns = np.broadcast_to(np.arange(width), (height, width))
+    rows = np.arange(height)[:, None]
+
+    # Index of the previous and next non-blank cell, if any
+    previous = np.maximum.accumulate(np.where(is_blank, -1, columns), axis=1)
+    following = np.minimum.accumulate(
+        np.where(is_blank, width, columns)[:, ::-1], axis=1
+    )[:, ::-1]
+
+    padded_color_ids = np.zeros((height, width + 1), dtype=color_ids.dtype)
+    padded_color_ids[:, :width] = np.where(is_blank, 0, color_ids)
+    previous_color_ids = padded_color_ids[rows, previous]
+    following_color_ids = padded_color_ids[rows, following]
+
+    return np.where(
+        is_blank,
+        np.where(previous_color_ids == following_color_ids, previous_color_ids, 0),
+        color_ids,
+    )
@@ -1,9 +1,17 @@
-from typing import List, Dict, Optional, Final, Any
+import sys
+import numpy as np
+from numpy.typing import NDArray
+from typing import List, Dict, Tuple, Optional, Final, Any
 from readchar import readkey, key
 
 from uniplot.multi_series import MultiSeries
-from uniplot.options import Options
+from uniplot.options import Options, CharacterSet
 from uniplot.param_initializer import validate_and_transform_options
+from uniplot.surface import Surface
+from uniplot.ring_buffer import RingBuffer
+from uniplot.heatmap_grid import HeatmapGrid
+import uniplot.layer_factory as layer_factory
+import uniplot.image as image
 import uniplot.sections as sections
 import uniplot.plot_elements as elements
 
@@ -23,6 +31,10 @@ def plot(ys: Any, xs: Optional[Any] = None, **kwargs) -> None:
       `uniplot.options.Options` class.
     """
     plt = plot_gen(xs=xs, ys=ys, **kwargs)
+    if plt.options.interactive:
+        # Precompute once, such that each frame renders fast regardless of the
+        # number of points
+        plt.series.build_pyramids()
 
     # Main loop for interactive mode. Will only be executed once when not in
     # interactive mode.
@@ -56,26 +68,58 @@ def plot(ys: Any, xs: Optional[Any] = None, **kwargs) -> None:
 
 
 class plot_gen:
-    def __init__(self, return_string=False, **kwargs) -> None:
+    def __init__(self, return_string=False, cell_updates=False, **kwargs) -> None:
+        # A heatmap grid is plotted instead of points, see `HeatmapGrid`
+        self.heatmap: Optional[HeatmapGrid] = kwargs.pop("heatmap", None)
+        if self.heatmap is not None:
+            kwargs = {**kwargs, **self.heatmap.plot_arguments()}
         self.default_arguments: Final[Dict] = kwargs
-        self.last_nr_of_lines: int = 0
+        # The lines printed since the last plot started, to only redraw the
+        # lines that changed
+        self.last_lines: List[str] = []
         self.return_string: Final[bool] = return_string
+        # Whether to only rewrite the cells of the plot that changed, which is
+        # worth it for large plots where little changes per frame
+        self.cell_updates: Final[bool] = cell_updates
+        self.last_surface: Optional[Surface] = None
+        self.last_surface_line: int = 0
+        self.last_y_axis_labels: List[str] = []
+        # The number of bytes written for the last frame
+        self.bytes_per_frame: int = 0
+        # The ring buffers of the last frame, with their number of values
+        # appended at the time
+        self.last_ring_buffers: List[Tuple[RingBuffer, int]] = []
         self.series: MultiSeries = MultiSeries([])
         self.options: Options = Options()
+        # The arguments that `self.options` were generated from
+        self.arguments: Dict = {}
         if "ys" in kwargs:
             self.series = MultiSeries(xs=kwargs.get("xs"), ys=kwargs.get("ys", []))
             if "xs" in kwargs:
                 del kwargs["xs"]
             del kwargs["ys"]
+            self.arguments = dict(kwargs)
             self.options = validate_and_transform_options(
-                series=self.series, kwargs=kwargs
+                series=self.series, kwargs=dict(kwargs)
             )
 
     def update(self, **kwargs) -> Optional[str]:
-        header_buffer: List[str] = []
-        body_buffer: List[str] = []
-
+        if "heatmap" in kwargs:
+            self.heatmap = kwargs.pop("heatmap")
+        if self.heatmap is not None:
+            # The view follows the grid, which scrolls as events are added
+            kwargs = {**kwargs, **self.heatmap.plot_arguments()}
         full_kwargs = {**self.default_arguments, **kwargs}
+        previous_options = self.options
+        ring_buffers = _ring_buffers(full_kwargs.get("ys"), full_kwargs.get("xs"))
+        # Without x values and bounds, the view follows the newest points of
+        # the ring buffers, in steps that allow to scroll the previous frame
+        follows_ring_buffers = (
+            ring_buffers is not None
+            and full_kwargs.get("xs") is None
+            and "x_min" not in full_kwargs
+            and "x_max" not in full_kwargs
+        )
 
         if "xs" in kwargs or "ys" in kwargs:
             self.series = MultiSeries(
@@ -87,39 +131,186 @@ class plot_gen:
             if "xs" in full_kwargs:
                 del full_kwargs["xs"]
             del full_kwargs["ys"]
+            self.arguments = dict(full_kwargs)
             self.options = validate_and_transform_options(
                 series=self.series, kwargs=full_kwargs
             )
+            if follows_ring_buffers and not self.options.x_as_log:
+                self.options.x_min, self.options.x_max = (
+                    layer_factory.scrolling_x_bounds(
+                        capacity=max(r.capacity for r in ring_buffers or []),
+                        last_index=max(r.nr_appended for r in ring_buffers or []),
+                        options=self.options,
+                    )
+                )
+
+        pixels, new_points_from = self._scroll(previous_options, ring_buffers)
+        self.last_ring_buffers = [(r, r.nr_appended) for r in ring_buffers or []]
+        return self._draw(pixels=pixels, new_points_from=new_points_from)
+
+    def append(self, ys: Any, xs: Optional[Any] = None) -> Optional[str]:
+        """
+        Append points to the series and update the plot.
+
+        Unless the automatic bounds of the view grow to show the new points,
+        only the new points are rendered, on top of the points that are
+        already plotted.
+
+        For a heatmap, the points are added to the grid as events, with the
+        `xs` as their times.
+        """
+        if self.heatmap is not None:
+            if xs is None:
+                raise ValueError("Events of a heatmap need their times as `xs`.")
+            self.heatmap.add(times=xs, values=ys)
+            return self.update()
+        if len(self.series) == 0:
+            return self.update(ys=ys, xs=xs)
+
+        new_points = MultiSeries(ys=ys, xs=xs)
+        if xs is None:
+            # Continue the serial index
+            new_points.xs = [x + len(y) for x, y in zip(new_points.xs, self.series.ys)]
+        nr_points = self.series.shape()
+        auto_bounds = {
+            bound_name: getattr(self.series, bound_name)()
+            for bound_name in ["x_min", "x_max", "y_min", "y_max"]
+            if bound_name not in self.arguments
+        }
+        self.series.append(new_points)
+
+        bounds_grow = False
+        for bound_name, bound in auto_bounds.items():
+            values = new_points.xs if bound_name.startswith("x") else new_points.ys
+            if all(np.isnan(v).all() for v in values):
+                continue
+            new_bound = getattr(new_points, bound_name)()
+            if "min" in bound_name:
+                bounds_grow |= new_bound < bound
+            else:
+                bounds_grow |= new_bound > bound
+        if bounds_grow or self.last_surface is None or self.last_surface.pixels is None:
+            self.options = validate_and_transform_options(
+                series=self.series, kwargs=dict(self.arguments)
+            )
+            return self._draw()
+        return self._draw(pixels=self.last_surface.pixels, new_points_from=nr_points)
+
+    def _scroll(
+        self, previous_options: Options, ring_buffers: Optional[List[RingBuffer]]
+    ) -> Tuple[Optional[NDArray], Optional[List[int]]]:
+        """
+        If the same ring buffers are plotted again and the view only scrolled
+        by whole pixel columns, returns the shifted pixels of the previous
+        frame and the index of the first new point of each series.
+        """
+        if (
+            ring_buffers is None
+            or self.last_surface is None
+            or self.last_surface.pixels is None
+            or [r for r, _ in self.last_ring_buffers] != ring_buffers
+            or not all(self.series.x_is_sorted)
+        ):
+            return (None, None)
+        nr_new_points = [r.nr_appended - n for r, n in self.last_ring_buffers]
+        # The last point of the previous frame is needed to connect lines, and
+        # x and y values need to be appended together
+        if any(
+            nr_new >= len(r) for r, nr_new in zip(ring_buffers, nr_new_points)
+        ) or nr_new_points[len(self.series) :] not in (
+            [],
+            nr_new_points[: len(self.series)],
+        ):
+            return (None, None)
+
+        nr_columns = layer_factory.scrolled_columns(previous_options, self.options)
+        if nr_columns is None:
+            return (None, None)
+        right_starts = layer_factory.scroll_pixels(
+            self.last_surface.pixels,
+            xs=self.series.xs,
+            ys=self.series.ys,
+            options=self.options,
+            nr_columns=nr_columns,
+        )
+        return (
+            self.last_surface.pixels,
+            [
+                min(len(y) - nr_new, right_start + 1)
+                for y, nr_new, right_start in zip(
+                    self.series.ys, nr_new_points, right_starts
+                )
+            ],
+        )
+
+    def print_subscript(self, text: str) -> None:
+        self.last_lines += str(text).split("\n")
+        print(text)
 
+    ###########
+    # private #
+    ###########
+
+    def _draw(
+        self,
+        pixels: Optional[NDArray] = None,
+        new_points_from: Optional[List[int]] = None,
+    ) -> Optional[str]:
         header_buffer = sections.generate_header(self.options)
 
         # Generate and collect plot content
-        body_buffer = []
         (
             x_axis_labels,
             y_axis_labels,
-            pixel_character_matrix,
-        ) = sections.generate_body_raw_elements(self.series, self.options)
-        body_buffer += sections.generate_body(
-            x_axis_labels, y_axis_labels, pixel_character_matrix, self.options
+            surface,
+        ) = sections.generate_body_raw_elements(
+            self.series,
+            self.options,
+            pixels=pixels,
+            new_points_from=new_points_from,
+            counts=None if self.heatmap is None else self.heatmap.counts,
         )
-
-        # Delete plot before we re-draw
-        if not self.return_string:
-            elements.erase_previous_lines(self.last_nr_of_lines)
+        body_buffer = sections.generate_body(
+            x_axis_labels, y_axis_labels, surface, self.options
+        )
+        last_surface, last_y_axis_labels = self.last_surface, self.last_y_axis_labels
+        self.last_surface = surface
+        self.last_y_axis_labels = y_axis_labels
 
         # Output plot
         output = "\n".join(header_buffer + body_buffer)
-        self.last_nr_of_lines = elements.count_lines(output)
         if self.return_string:
             return output
-        print(output)
+        lines = output.split("\n")
+        # The surface starts below the header and the top of the frame
+        surface_line = len("\n".join(header_buffer).split("\n")) if header_buffer else 0
+        surface_line += 1
+        if len(self.last_lines) == 0:
+            frame = output + "\n"
+        else:
+            line_updates: Dict[int, str] = {}
+            if (
+                self.cell_updates
+                and last_surface is not None
+                and surface_line == self.last_surface_line
+                and y_axis_labels == last_y_axis_labels
+            ):
+                row_updates = elements.cell_updates(
+                    last_surface, surface, column_offset=1
+                )
+                line_updates = {
+                    surface_line + row: update for row, update in row_updates.items()
+                }
+            frame = elements.redraw_lines(self.last_lines, lines, line_updates)
+
+        # Write the whole frame at once, to avoid flicker
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        self.bytes_per_frame = len(frame.encode())
+        self.last_lines = lines
+        self.last_surface_line = surface_line
         return None
 
-    def print_subscript(self, text: str) -> None:
-        self.last_nr_of_lines += elements.count_lines(text)
-        print(text)
-
 
 def plot_to_string(ys: Any, xs: Optional[Any] = None, **kwargs) -> str:
     """
@@ -191,3 +382,145 @@ def histogram_to_string(
     # Histograms usually make sense only with lines
     kwargs["lines"] = True
     return str(plt.update(xs=xs_histo, ys=ys_histo, **kwargs))
+
+
+def imshow(
+    matrix: Any,
+    color_map: Any = "viridis",
+    v_min: Optional[float] = None,
+    v_max: Optional[float] = None,
+    **kwargs,
+) -> None:
+    """
+    Show a 2D array as an image on the terminal, for instance a confusion
+    matrix or a spectrogram.
+
+    Parameters:
+
+    - `matrix` is the 2D array of values to show, where the first row is
+      shown at the top. NaN values are left blank.
+    - `color_map` is either the name of a color map in
+      `uniplot.image.COLOR_MAPS`, or a list of colors from low to high values.
+    - `v_min` and `v_max` are the values of the lowest and highest color.
+      They default to the minimum and maximum of the image.
+    - Any additional keyword arguments are passed to the
+      `uniplot.options.Options` class.
+    """
+    print(imshow_to_string(matrix, color_map, v_min, v_max, **kwargs))
+
+
+def imshow_to_string(
+    matrix: Any,
+    color_map: Any = "viridis",
+    v_min: Optional[float] = None,
+    v_max: Optional[float] = None,
+    **kwargs,
+) -> str:
+    """
+    Same as `imshow`, but the return type is string.
+
+    Can be used to integrate uniplot in other applications, or if the output is
+    desired to be not stdout.
+    """
+    values = np.asarray(matrix, dtype=float)
+    if values.ndim != 2 or values.size == 0:
+        raise ValueError("The image needs to be a non-empty 2D array.")
+
+    defaults = Options()
+    kwargs["width"], kwargs["height"] = image.canvas_size(
+        values.shape,
+        max_width=defaults.width,
+        max_height=defaults.height,
+        width=kwargs.get("width"),
+        height=kwargs.get("height"),
+    )
+    options = Options(**kwargs)
+
+    # Every character cell shows two pixels on top of each other
+    pixels = image.resample(values, 2 * options.height, options.width)
+    is_valid = ~np.isnan(pixels)
+    valid_pixels = pixels[is_valid]
+    if v_min is None:
+        v_min = float(valid_pixels.min()) if valid_pixels.size > 0 else 0.0
+    if v_max is None:
+        v_max = float(valid_pixels.max()) if valid_pixels.size > 0 else 1.0
+    surface = image.image_surface(
+        image.colorize(pixels, v_min, v_max, color_map), is_valid
+    )
+
+    x_axis_labels, y_axis_labels = sections.generate_image_axis_labels(
+        values.shape[0], values.shape[1], options
+    )
+    lines = sections.generate_header(options) + sections.generate_body(
+        x_axis_labels, y_axis_labels, surface, options
+    )
+    return "\n".join(lines)
+
+
+def sparklines(
+    series: Any,
+    width: int = 20,
+    height: int = 1,
+    character_set: Any = "braille",
+) -> List[str]:
+    """
+    Returns one sparkline string per series, for instance to print the trends
+    of many metrics at once.
+
+    Parameters:
+
+    - `series` is either a list of series, which can have different lengths,
+      or a 2D NumPy array with one series per row.
+    - `width` is the number of characters of each sparkline.
+    - `height` is the number of lines of each sparkline.
+    - `character_set` is the character set to draw the lines with, either
+      `"braille"`, `"block"` or `"ascii"`.
+
+    Each series is scaled to its own minimum and maximum, and all series are
+    rendered together without any axes or labels.
+    """
+    values = [np.asarray(s, dtype=float) for s in series]
+    if any(v.ndim != 1 for v in values):
+        raise ValueError("Each series of a sparkline needs to be one-dimensional.")
+    if len(values) == 0:
+        return []
+
+    options = Options(
+        character_set=CharacterSet.from_string(character_set)
+        if isinstance(character_set, str)
+        else character_set,
+        width=width,
+        height=height,
+    )
+    lines = ["".join(row) for row in layer_factory.render_sparklines(values, options)]
+    return [
+        "\n".join(lines[start : start + height])
+        for start in range(0, len(lines), height)
+    ]
+
+
+###########
+# private #
+###########
+
+
+def _ring_buffers(ys: Any, xs: Any) -> Optional[List[RingBuffer]]:
+    """
+    Returns the ring buffers of the `ys`, followed by those of the `xs`, if
+    all series are ring buffers. Otherwise, returns `None`.
+    """
+    if ys is None:
+        return None
+    ring_buffers: List[RingBuffer] = []
+    for series in [ys, xs]:
+        if series is None:
+            continue
+        if isinstance(series, RingBuffer):
+            ring_buffers.append(series)
+        elif isinstance(series, (list, tuple)) and all(
+            isinstance(row, RingBuffer) for row in series
+        ):
+            ring_buffers += list(series)
+        else:
+            return None
+    return ring_buffers or None